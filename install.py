@@ -8,14 +8,19 @@ capabilities, and detailed logging.
 """
 
 import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import json
+from collections.abc import Callable
 from pathlib import Path
 import traceback
 
 from installers.messages import message as msg
 from installers.messages import color
+from installers.pool import get_pool, shutdown_pool
 from installers import (
     BinaryInstaller,
     ScriptInstaller,
@@ -37,16 +42,19 @@ INSTALLERS_MAP = {
 def load_config():
     """Load configuration from JSON file."""
     config_file = Path(__file__).parent / "install_config.json"
-    if not config_file.exists():
+    try:
+        data = config_file.read_bytes()
+    except FileNotFoundError:
         msg.error(f"Configuration file {config_file} not found")
         sys.exit(1)
 
-    with open(config_file) as f:
-        return json.load(f)
+    return json.loads(data)
 
 
 def setup_logger(
-    name: str = "install", level: int = logging.INFO, log_to_file: str = "install.log"
+    name: str = "install",
+    level: int = logging.INFO,
+    log_to_file: Path | str = "install.log",
 ) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(level)
@@ -68,21 +76,52 @@ def setup_logger(
         root.setLevel(level)
         file_handler = logging.FileHandler(log_to_file)
         file_handler.setFormatter(formatter)
-        root.addHandler(file_handler)
+        # Callers only enqueue records; a background listener does the file I/O
+        # so concurrent installers never contend on the file handler's lock.
+        # Records reach the file as they arrive, so a killed run keeps its log.
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
 
     return logger
 
 
+def run_step(step: Callable[[], bool], logger: logging.Logger) -> bool:
+    """Run an installer step, treating unexpected exceptions as a failure."""
+    try:
+        return step()
+    except Exception as e:
+        logger.error(f"Unexpected error occurred: {e}")
+        logger.error(traceback.format_exc())
+        msg.error("An unexpected error occurred. Check logs for details.")
+        return False
+
+
+def run_buffered(step: Callable[[], bool], logger: logging.Logger) -> bool:
+    """Run a step on a pool thread, printing its messages as one block at the end.
+
+    Pooled installers run side by side, so without this their headers,
+    progress lines and errors would mix on the terminal.
+    """
+    with msg.batch():
+        return run_step(step, logger)
+
+
 def install_all_tools(
     dry_run: bool = False,
     tools_to_install: list[str] | None = None,
     force: bool = False,
+    fail_fast: bool = False,
+    jobs: int = 1,
 ) -> bool:
     """Install all tools using simple loops."""
 
-    log_file = "install.log"
+    # Absolute, so the log location does not depend on any later cwd change
+    log_file = Path("install.log").resolve()
 
-    logger = setup_logger()
+    logger = setup_logger(log_to_file=log_file)
 
     config = load_config()
 
@@ -98,33 +137,75 @@ def install_all_tools(
                 f"Available components: {', '.join(available_tools)}", color.cyan
             )
             return False
-        target_components = tools_to_install
+        target_components = set(tools_to_install)
     else:
-        target_components = available_tools
-
-    success = True
+        target_components = set(available_tools)
 
+    # Intersect each category with the requested set once; categories with
+    # nothing selected are skipped without looking at their tools.
+    selected = []
     for installer_name, installer_cls in INSTALLERS_MAP.items():
-        if config.get(installer_name):
-            for tool_name, tool_config in config[installer_name].items():
-                if tool_name in target_components:
-                    installer = installer_cls(
-                        **tool_config,
-                        name=tool_name,
-                        dry_run=dry_run,
-                        force=force,
-                        log_file=log_file,
-                    )
-                    try:
-                        result = installer.install()
-                        success = success and result
-                    except Exception as e:
-                        logger.error(f"Unexpected error occurred: {e}")
-                        logger.error(traceback.format_exc())
-                        msg.error(
-                            "An unexpected error occurred. Check logs for details."
-                        )
-                        success = False
+        tool_configs = config.get(installer_name, {})
+        wanted = tool_configs.keys() & target_components
+        if not wanted:
+            continue
+        selected.extend(
+            (installer_cls, tool_name, tool_config)
+            for tool_name, tool_config in tool_configs.items()
+            if tool_name in wanted
+        )
+
+    installers = [
+        installer_cls(
+            **tool_config,
+            name=tool_name,
+            dry_run=dry_run,
+            force=force,
+            log_file=log_file,
+        )
+        for installer_cls, tool_name, tool_config in selected
+    ]
+
+    success = True
+    installed = []
+    error = msg.error  # bound once, called from inside the loop
+
+    # Binary downloads and source builds are independent and never prompt, so
+    # with jobs > 1 they all start up front on the shared pool; everything
+    # else runs here in order, and results are still taken in order. Each
+    # pooled installer's output is held back and printed as one block.
+    pool = get_pool(jobs) if jobs > 1 else None
+    if pool is not None:
+        # Concurrent builds would each run make -j<ncpu>; split the CPUs instead
+        builds = [i for i in installers if isinstance(i, SourceInstaller)]
+        for build in builds:
+            build.share_cpus(min(jobs, len(builds)))
+    try:
+        futures = [
+            pool.submit(run_buffered, installer.install, logger)
+            if pool is not None and installer.parallel_safe
+            else None
+            for installer in installers
+        ]
+        for installer, future in zip(installers, futures):
+            if future is not None:
+                result = future.result()
+            else:
+                result = run_step(installer.install, logger)
+            if result:
+                installed.append(installer)
+
+            success &= result
+            if not result and fail_fast:
+                error(f"\nStopping after {installer.name} failed (--fail-fast)")
+                shutdown_pool(cancel_futures=True)
+                break
+    finally:
+        shutdown_pool()
+
+    # Interactive follow-up steps run last so they never hold up the installs
+    for installer in installed:
+        success &= run_step(installer.finalize, logger)
 
     msg.custom(f"\nDetailed logs written to {log_file}", color.orange)
 
@@ -136,12 +217,12 @@ def install_all_tools(
     else:
         if dry_run:
             msg.custom(
-                "Dry run completed with errors. Check install.log for details.",
+                f"Dry run completed with errors. Check {log_file} for details.",
                 color.red,
             )
         else:
             msg.custom(
-                "Installation completed with errors. Check install.log for details.",
+                f"Installation completed with errors. Check {log_file} for details.",
                 color.red,
             )
 
@@ -173,6 +254,9 @@ Examples:
   %(prog)s --force                  # Force installation even if already installed
   %(prog)s --components dotfiles config vifm  # Install specific components
   %(prog)s --list                   # List available components
+  %(prog)s --fail-fast              # Stop at the first failed component
+  %(prog)s --jobs 4                 # Download or build up to 4 components at once
+  %(prog)s --purge-cache            # Delete cached source trees
         """,
     )
 
@@ -194,21 +278,53 @@ Examples:
         help="Specific components to install (use --list to see all available)",
     )
 
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first component that fails to install",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of binary/source components to install concurrently (default: 1)",
+    )
+
     parser.add_argument(
         "-l", "--list", action="store_true", help="List available components and exit"
     )
 
+    parser.add_argument(
+        "--purge-cache",
+        action="store_true",
+        help="Delete cached source trees (~/.cache/shell-installer) and exit",
+    )
+
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     if args.list:
         list_components()
         return
 
+    if args.purge_cache:
+        SourceInstaller.purge_cache()
+        msg.custom("Source cache purged", color.green)
+        return
+
     if args.dry_run:
         msg.custom("Dry run mode - No changes will be made", color.green)
 
     success = install_all_tools(
-        dry_run=args.dry_run, tools_to_install=args.components, force=args.force
+        dry_run=args.dry_run,
+        tools_to_install=args.components,
+        force=args.force,
+        fail_fast=args.fail_fast,
+        jobs=args.jobs,
     )
 
     sys.exit(0 if success else 1)
@@ -5,6 +5,7 @@ import logging
 import shutil
 from pathlib import Path
 from dataclasses import dataclass, field
+from typing import ClassVar
 
 from .messages import message as msg
 from .messages import color
@@ -12,7 +13,7 @@ from .messages import color
 logger = logging.getLogger(__name__)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Installer(ABC):
     """Base installer class with common functionality."""
 
@@ -25,20 +26,22 @@ class Installer(ABC):
     log_file: Path | str = "install.log"
     required_deps: list[str] = field(default_factory=list)
 
+    # Whether install() may run on a worker thread next to other installs;
+    # only installers that never prompt and share no state opt in
+    parallel_safe: ClassVar[bool] = False
+
     def __post_init__(self):
         """Create local installation directory."""
-        self.log_file = Path(self.log_file).expanduser()
+        self.log_file = Path(self.log_file).expanduser().resolve()
 
         self.installation_path = Path(self.installation_path).expanduser()
 
-        if not self.installation_path.exists():
+        # A single mkdir covers both "missing" and "exists but is not a directory"
+        try:
             self.installation_path.mkdir(parents=True, exist_ok=True)
-        else:
-            if not self.installation_path.is_dir():
-                msg.error(
-                    f"Installation path {self.installation_path} is not a directory"
-                )
-                raise NotADirectoryError(f"{self.installation_path} is not a directory")
+        except (FileExistsError, NotADirectoryError):
+            msg.error(f"Installation path {self.installation_path} is not a directory")
+            raise NotADirectoryError(f"{self.installation_path} is not a directory")
 
     @abstractmethod
     def _install(self) -> bool:
@@ -55,6 +58,10 @@ class Installer(ABC):
             return False
         return self._install()
 
+    def finalize(self) -> bool:
+        """Run deferred post-install steps once every component is installed."""
+        return True
+
     def _check_installed(self, name: str) -> bool:
         """Check if the tool is already installed."""
         installed = False
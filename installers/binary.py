@@ -1,54 +1,105 @@
 """Binary installer for pre-built binaries from GitHub releases."""
 
-import shutil
-import tempfile
+import json
+import platform
+import re
+import subprocess
+import tarfile
 import logging
-from pathlib import Path
-from dataclasses import dataclass
+import urllib.request
+from pathlib import Path, PurePosixPath
+from dataclasses import dataclass, field
+from typing import ClassVar
 
 from .messages import message as msg
 from .messages import color
 from .base import Installer
-from .tools import Executor
+from .tools import Executor, open_url, tildify
 from .custom.github import GitHubSSHSetup
 
 logger = logging.getLogger(__name__)
 
+GITHUB_API = "https://api.github.com"
 
-@dataclass(kw_only=True)
+# Names release assets commonly use for each machine architecture
+ARCH_ALIASES = {
+    "x86_64": "x86_64|amd64",
+    "amd64": "x86_64|amd64",
+    "aarch64": "aarch64|arm64",
+    "arm64": "aarch64|arm64",
+}
+
+
+def _default_asset_re() -> re.Pattern[str]:
+    """Match .tar.gz asset names for this machine's OS and architecture."""
+    machine = platform.machine().lower()
+    arch = ARCH_ALIASES.get(machine, re.escape(machine))
+    return re.compile(rf"(?i)^(?=.*{platform.system()})(?=.*({arch})).*\.tar\.gz$")
+
+
+DEFAULT_ASSET_RE = _default_asset_re()
+
+VERSION_RE = re.compile(r"\d+(?:\.\d+)+")
+
+
+@dataclass(kw_only=True, slots=True)
 class BinaryInstaller(Installer):
     """Handles installation of pre-built binaries."""
 
     binary_name: str = ""
     version: str = ""
     archive_pattern: str = ""
+    repo: str = ""
+    release_tag: str = "v{version}"
+    asset_pattern: str = ""
+    sha256: str = ""
+    _asset_sha256: str = field(default="", init=False, repr=False)
+    _gh_setup_pending: bool = field(default=False, init=False, repr=False)
+    _archive_url: str = field(default="", init=False, repr=False)
+    _archive_error: str = field(default="", init=False, repr=False)
+
+    # GitHub release metadata keyed by (repo, tag), shared by all instances
+    _releases: ClassVar[dict[tuple[str, str], dict]] = {}
+
+    parallel_safe: ClassVar[bool] = True
 
     def __post_init__(self):
         """Post-init setup."""
+        # Installer.__post_init__ expands and creates installation_path
         if not self.installation_path:
             self.installation_path = Path.home() / "local/bin"
-        else:
-            self.installation_path = Path(self.installation_path).expanduser()
 
         self.check_cmd = self.binary_name
-        self.required_deps.extend(["wget", "tar"])
 
-        super().__post_init__()
-
-    def _install(self) -> bool:
-        """Install the binary from archive_pattern."""
+        # Format the URL up front; a bad pattern is reported when installing
         try:
-            url = self.archive_pattern.format(version=self.version)
-        except ValueError as e:
-            msg.error(f"    Invalid archive pattern:\n    {e}")
-            return False
+            self._archive_url = self.archive_pattern.format(version=self.version)
+        except (KeyError, IndexError, ValueError) as e:
+            self._archive_error = f"{type(e).__name__}: {e}"
 
-        msg.custom(
-            f"    Installing {self.binary_name} from releases:\n    {url}", color.orange
-        )
+        super(BinaryInstaller, self).__post_init__()
+
+    def _install(self) -> bool:
+        """Install the binary from its GitHub release or archive_pattern."""
+        if not self.force and self._installed_version_matches():
+            msg.custom(
+                f"    {self.binary_name} {self.version} already present, skipping",
+                color.green,
+            )
+            return True
 
         if self.dry_run:
-            display_path = str(self.installation_path).replace(str(Path.home()), "~")
+            # Resolving the asset would spend the GitHub API's small
+            # unauthenticated rate limit, so only say where it would come from
+            if self.repo:
+                source = f"{self.repo} release {self._release_tag()}"
+            else:
+                source = self._archive_url or self.archive_pattern
+            msg.custom(
+                f"    Installing {self.binary_name} from releases:\n    {source}",
+                color.orange,
+            )
+            display_path = tildify(self.installation_path)
 
             msg.custom(
                 f"    Would download and install {self.binary_name} to {display_path}",
@@ -56,74 +107,160 @@ class BinaryInstaller(Installer):
             )
             return True
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        url = self._resolve_url()
+        if not url:
+            return False
 
-            msg.custom(f"    Downloading {self.name} binary...", color.cyan)
+        msg.custom(
+            f"    Installing {self.binary_name} from releases:\n    {url}", color.orange
+        )
 
-            result = Executor().execute_cmd(
-                ["wget", "-q", "-O", str(temp_path / f"{self.name}.tar.gz"), url],
-                cwd=temp_path,
-                message=(f"{self.name} download started"),
-            )
+        msg.custom(f"    Downloading {self.name} binary...", color.cyan)
+
+        # Write next to the target and rename over it, so a binary that is in
+        # use is replaced atomically rather than rewritten in place.
+        target_binary = self.installation_path / self.binary_name
+        partial = target_binary.with_name(f".{self.binary_name}.part")
+        result = Executor().extract_member(
+            url,
+            dest=partial,
+            match=self._is_binary_member,
+            message=f"{self.name} download started",
+            sha256=self.sha256 or self._asset_sha256,
+        )
 
-            if not result.success:
-                return False
+        if not result.success:
+            partial.unlink(missing_ok=True)
+            msg.error(f"    {self.binary_name} binary could not be installed")
+            return False
 
-            result = Executor().execute_cmd(
-                ["tar", "-xzf", f"{self.name}.tar.gz"],
-                cwd=temp_path,
-                message=f"{self.name} extraction started",
-            )
+        partial.chmod(0o755)
+        partial.replace(target_binary)
 
-            if not result.success:
-                return False
+        display_path = tildify(self.installation_path)
+        msg.custom(
+            f"    {self.name} installed successfully to {display_path}", color.green
+        )
 
-            # Find and copy binary
-            display_path = str(self.installation_path).replace(str(Path.home()), "~")
-            msg.custom(f"    Copying {self.name} to {display_path}...", color.cyan)
-            success = self._find_and_copy_binary(
-                temp_path,
-                Path(self.installation_path).expanduser(),
-            )
-            if not success:
-                return False
-
-        # Handle GitHub CLI authentication if binary is "gh"
-        if self.binary_name == "gh":
-            gh_binary = Path(self.installation_path) / self.binary_name
-            setup = GitHubSSHSetup(gh_binary)
-            success = setup.authenticate_cli()
-            if success:
-                success = setup.setup_ssh_key()
-            return success
+        self._version_stamp().write_text(self.version)
 
+        # GitHub CLI authentication is interactive, so it waits for finalize()
+        self._gh_setup_pending = self.binary_name == "gh"
+
+        return True
+
+    def finalize(self) -> bool:
+        """Authenticate the GitHub CLI and set up its SSH key after installs."""
+        if not self._gh_setup_pending:
+            return True
+        self._gh_setup_pending = False
+
+        msg.custom(f"\n* {self.name} post-install", color.pink)
+        gh_binary = self.installation_path / self.binary_name
+        setup = GitHubSSHSetup(gh_binary)
+        success = setup.authenticate_cli()
+        if success:
+            success = setup.setup_ssh_key()
         return success
 
-    def _find_and_copy_binary(
-        self,
-        temp_path: Path,
-        target_dir: Path,
-    ) -> bool:
-        """Find the binary in extracted files and copy to target directory."""
-        binary_path = None
-        for item in temp_path.rglob(self.binary_name):
-            if item.is_file() and item.stat().st_mode & 0o111:  # Check if executable
-                binary_path = item
-                break
-
-        if not binary_path:
-            raise FileNotFoundError(
-                f"{self.binary_name} binary not found in downloaded archive"
+    def _resolve_url(self) -> str:
+        """Return the archive URL, preferring the release's own asset list."""
+        if self.repo:
+            try:
+                pattern = self._asset_re()
+            except re.error as e:
+                msg.error(f"    Invalid asset pattern:\n    {e}")
+                return ""
+            url = self._resolve_asset_url(pattern)
+            if url:
+                return url
+            if not self.archive_pattern:
+                msg.error("    No release asset matched and no archive_pattern is set")
+                return ""
+            msg.warning("    No matching release asset, using archive_pattern")
+
+        if self._archive_error:
+            msg.error(f"    Invalid archive pattern:\n    {self._archive_error}")
+            return ""
+        return self._archive_url
+
+    def _release_tag(self) -> str:
+        """release_tag with its {version} placeholder filled in."""
+        return self.release_tag.replace("{version}", self.version)
+
+    def _asset_re(self) -> re.Pattern[str]:
+        """Compile asset_pattern, or this platform's default pattern.
+
+        asset_pattern is a regex, so only a literal {version} token is
+        substituted; quantifiers such as {1,3} are left alone.
+        """
+        if not self.asset_pattern:
+            return DEFAULT_ASSET_RE
+        version = re.escape(self.version)
+        return re.compile(self.asset_pattern.replace("{version}", version))
+
+    def _resolve_asset_url(self, pattern: re.Pattern[str]) -> str:
+        """Pick the asset matching pattern from the GitHub release of self.version."""
+        tag = self._release_tag()
+        key = (self.repo, tag)
+        release = self._releases.get(key)
+        if release is None:
+            request = urllib.request.Request(
+                f"{GITHUB_API}/repos/{self.repo}/releases/tags/{tag}",
+                headers={"Accept": "application/vnd.github+json"},
             )
+            try:
+                with open_url(request, timeout=30) as response:
+                    release = json.load(response)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not fetch release {tag} of {self.repo}: {e}")
+                return ""
+            self._releases[key] = release
 
-        target_binary = target_dir / self.binary_name
-        shutil.copy2(binary_path, target_binary)
-        target_binary.chmod(0o755)
+        for asset in release.get("assets", []):
+            if pattern.search(asset["name"]):
+                # Newer releases publish the asset digest as "sha256:<hex>"
+                digest = asset.get("digest") or ""
+                if digest.startswith("sha256:"):
+                    self._asset_sha256 = digest.removeprefix("sha256:")
+                return asset["browser_download_url"]
+        return ""
 
-        display_path = str(self.installation_path).replace(str(Path.home()), "~")
-        msg.custom(
-            f"    {self.name} installed successfully to {display_path}", color.green
+    def _is_binary_member(self, member: tarfile.TarInfo) -> bool:
+        """Match the executable named binary_name, wherever it sits in the archive."""
+        return (
+            member.isfile()
+            and PurePosixPath(member.name).name == self.binary_name
+            and bool(member.mode & 0o111)
         )
 
-        return True
+    def _version_stamp(self) -> Path:
+        """Path of the file recording which version was installed."""
+        return self.installation_path / f".{self.binary_name}.version"
+
+    def _installed_version_matches(self) -> bool:
+        """Check whether installation_path already holds the requested version."""
+        target = self.installation_path / self.binary_name
+        if not self.version or not target.exists():
+            return False
+
+        stamp = self._version_stamp()
+        if stamp.exists() and stamp.read_text().strip() == self.version:
+            return True
+
+        return self._installed_version(target) == self.version.lstrip("v")
+
+    def _installed_version(self, target: Path) -> str:
+        """Parse the first dotted version number out of `target --version`."""
+        try:
+            result = subprocess.run(
+                [str(target), "--version"],
+                capture_output=True,
+                text=True,
+                timeout=2,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return ""
+        match = VERSION_RE.search(result.stdout or result.stderr)
+        return match.group(0) if match else ""
@@ -1,4 +1,3 @@
-import re
 import logging
 from dataclasses import dataclass
 from pathlib import Path
@@ -6,14 +5,14 @@ from pathlib import Path
 from ..base import Installer
 from ..messages import message as msg
 from ..messages import color
+from .github import EMAIL_RE
 
 logger = logging.getLogger(__name__)
 
 LOCAL_CONFIG = Path.home() / ".config" / "git" / "local"
-EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class GitIdentityInstaller(Installer):
     """Creates ~/.config/git/local with [user] name and email if absent."""
 
@@ -1,8 +1,14 @@
+import functools
 import logging
+import mmap
 import os
 from pathlib import Path
 import re
 import socket
+import subprocess
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from ..messages import message as msg
 from ..messages import color
@@ -11,14 +17,29 @@ from ..tools import Executor
 
 logger = logging.getLogger(__name__)
 
+EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 
+# Seconds a fetched `gh ssh-key list` stays valid
+KEY_CACHE_TTL = 60
+
+SSH_DIR = Path.home() / ".ssh"
+GITHUB_SSH_CONFIG = """Host github.com
+    HostName github.com
+    User git
+    IdentityFile ~/.ssh/github
+    IdentitiesOnly yes
+"""
+
+
+@functools.lru_cache(maxsize=1)
 def get_short_hostname():
     """Get the short hostname of the machine."""
     return socket.gethostname().split(".")[0]
 
 
+@functools.lru_cache(maxsize=1)
 def get_ip_address():
-    """Get the IP address of the machine."""
+    """Get the IP address of the machine (looked up once per run)."""
     # This reliably gets the main non-loopback IP address,
     # even on multi-interface systems.
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -27,14 +48,34 @@ def get_ip_address():
         s.connect(("8.8.8.8", 80))
         ip = s.getsockname()[0]
     except Exception:
-        ip = "127.0.0.1"
+        ip = _resolve_hostname_ip()
     finally:
         s.close()
     return ip
 
 
-short_hostname = get_short_hostname()
-ip = get_ip_address()
+def _resolve_hostname_ip() -> str:
+    """Resolve the hostname to its first non-loopback address, if any."""
+    try:
+        addresses = socket.gethostbyname_ex(socket.gethostname())[2]
+    except OSError:
+        return "127.0.0.1"
+    return next((a for a in addresses if not a.startswith("127.")), "127.0.0.1")
+
+
+def _file_contains(path: Path, needle: bytes) -> bool:
+    """Search a file for needle through a read-only mapping, without decoding it."""
+    try:
+        with (
+            open(path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            return mm.find(needle) != -1
+    except FileNotFoundError:
+        return False
+    except ValueError:
+        # Empty files cannot be mapped, and contain nothing anyway
+        return False
 
 
 def _ssh_to_https_url(ssh_url: str) -> str:
@@ -48,8 +89,39 @@ def _ssh_to_https_url(ssh_url: str) -> str:
 class GitHubSSHSetup:
     def __init__(self, gh_binary: Path):
         self.gh_binary = gh_binary
+        # (fetch time, key title -> key ids) from the last `gh ssh-key list`
+        self._key_cache: tuple[float, dict[str, list[str]]] | None = None
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        """Executor shared by every command this setup runs, made on first use."""
+        if self._executor is None:
+            self._executor = Executor()
+        return self._executor
+
+    def is_authenticated(self) -> bool:
+        """Return True if gh already holds a valid login for github.com."""
+        try:
+            result = subprocess.run(
+                [str(self.gh_binary), "auth", "status", "--hostname", "github.com"],
+                capture_output=True,
+                text=True,
+                check=False,  # not being logged in is an answer, not an error
+            )
+        except OSError as e:
+            logger.info(f"Could not query gh auth status: {e}")
+            return False
+        logger.info(f"gh auth status exited with {result.returncode}")
+        return result.returncode == 0
 
     def authenticate_cli(self) -> bool:
+        if self.is_authenticated():
+            msg.custom(
+                "\n    GitHub CLI is already authenticated, skipping.", color.yellow
+            )
+            return True
+
         msg_lines = [
             ("\n    Setting up GitHub CLI authentication...", color.cyan),
             ("    You'll need a GitHub Personal Access Token (PAT)", color.yellow),
@@ -81,7 +153,7 @@ class GitHubSSHSetup:
         msg.custom("    Authenticating with GitHub...", color.cyan)
 
         try:
-            result = Executor().execute_cmd(
+            result = self.executor.execute_cmd(
                 [
                     str(self.gh_binary),
                     "auth",
@@ -109,7 +181,6 @@ class GitHubSSHSetup:
 
     def get_email_for_key(self) -> str:
         """Prompt the user for email and validate."""
-        email_pattern = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
         while True:
             email = input(
                 "    Enter your email for SSH key [leave blank to skip]: "
@@ -123,7 +194,7 @@ class GitHubSSHSetup:
                     color.yellow,
                 )
                 return ""
-            if email_pattern.match(email):
+            if EMAIL_RE.match(email):
                 return email
             msg.custom(
                 "    Invalid email format. Please enter a valid email address.",
@@ -133,7 +204,8 @@ class GitHubSSHSetup:
     def generate_ssh_key(self, ssh_key_path: Path, email: str) -> bool:
         """Generate a new SSH key, possibly overwriting the existing one."""
         # If key exists, ask about overwrite
-        if ssh_key_path.exists() or ssh_key_path.with_suffix(".pub").exists():
+        pubkey_path = ssh_key_path.with_suffix(".pub")
+        if ssh_key_path.exists() or pubkey_path.exists():
             msg.custom("    SSH key 'github' already exists.", color.yellow)
             overwrite = (
                 input("    Do you want to overwrite it? [y/N]: ").strip().lower()
@@ -141,13 +213,11 @@ class GitHubSSHSetup:
             if overwrite not in ["y", "yes"]:
                 msg.custom("    SSH key generation skipped.", color.yellow)
                 return False
-            if ssh_key_path.exists():
-                ssh_key_path.unlink()
-            if ssh_key_path.with_suffix(".pub").exists():
-                ssh_key_path.with_suffix(".pub").unlink()
+            ssh_key_path.unlink(missing_ok=True)
+            pubkey_path.unlink(missing_ok=True)
             msg.custom("    Existing SSH keys removed.", color.cyan)
 
-        result = Executor().execute_cmd(
+        result = self.executor.execute_cmd(
             [
                 "ssh-keygen",
                 "-t",
@@ -168,29 +238,35 @@ class GitHubSSHSetup:
         return True
 
     def get_github_key_id_by_title(self, title: str) -> list[str]:
-        result = Executor().execute_cmd(
+        if self._key_cache is not None:
+            fetched_at, keys = self._key_cache
+            if time.monotonic() - fetched_at < KEY_CACHE_TTL:
+                return list(keys.get(title, []))
+
+        result = self.executor.execute_cmd(
             [
                 str(self.gh_binary),
                 "ssh-key",
                 "list",
             ],
             message="Checking existing SSH keys on GitHub",
+            capture_on_success=True,
         )
         if not result.success or result.result is None:
             return []
 
-        key_ids = []
-        for line in result.result.stdout.strip().splitlines():
-            parts = line.strip().split()
+        keys = defaultdict(list)
+        for line in result.result.stdout.splitlines():
+            # Only the title (column 0) and id (column 4) are needed
+            parts = line.split(None, 5)
             if len(parts) >= 5:
-                key_title, key_id = parts[0], parts[4]
-                if key_title == title:
-                    key_ids.append(key_id)
-        return key_ids
+                keys[parts[0]].append(parts[4])
+        self._key_cache = (time.monotonic(), keys)
+        return list(keys.get(title, []))
 
     def delete_github_key(self, key_id: str) -> bool:
         """Delete the GitHub SSH key with the given ID."""
-        result = Executor().execute_cmd(
+        result = self.executor.execute_cmd(
             [
                 str(self.gh_binary),
                 "ssh-key",
@@ -201,6 +277,7 @@ class GitHubSSHSetup:
             message=f"Deleting SSH key id={key_id} from GitHub",
         )
         if result.success:
+            self._key_cache = None
             msg.custom(
                 f"    Deleted existing SSH key id={key_id} from GitHub.",
                 color.green,
@@ -212,7 +289,7 @@ class GitHubSSHSetup:
 
     def upload_ssh_key_to_github(self, pubkey_path: Path, title: str) -> bool:
         """Upload a public SSH key to GitHub with a given title."""
-        result = Executor().execute_cmd(
+        result = self.executor.execute_cmd(
             [
                 str(self.gh_binary),
                 "ssh-key",
@@ -224,6 +301,7 @@ class GitHubSSHSetup:
             message="SSH key upload started",
         )
         if result.success:
+            self._key_cache = None
             msg.custom("    SSH key uploaded to GitHub successfully!", color.green)
             return True
         msg.error("    SSH key upload to GitHub failed!")
@@ -231,29 +309,20 @@ class GitHubSSHSetup:
 
     def configure_ssh_config(self) -> bool:
         try:
-            ssh_config_path = Path.home() / ".ssh" / "config"
-            github_config = """Host github.com
-    HostName github.com
-    User git
-    IdentityFile ~/.ssh/github
-    IdentitiesOnly yes
-"""
-            if ssh_config_path.exists():
-                with open(ssh_config_path) as f:
-                    content = f.read()
-                if "Host github.com" in content:
-                    msg.custom(
-                        (
-                            "    'github' already exists in ~/.ssh/config\n"
-                            "    Skipping configuration."
-                        ),
-                        color.yellow,
-                    )
-                    return True
+            ssh_config_path = SSH_DIR / "config"
+            if _file_contains(ssh_config_path, b"Host github.com"):
+                msg.custom(
+                    (
+                        "    'github' already exists in ~/.ssh/config\n"
+                        "    Skipping configuration."
+                    ),
+                    color.yellow,
+                )
+                return True
             msg.custom("    Configuring SSH config for GitHub...", color.cyan)
             with open(ssh_config_path, "a") as f:
-                f.write(f"\n{github_config}")
-            ssh_config_path.chmod(0o600)
+                os.fchmod(f.fileno(), 0o600)
+                f.write(f"\n{GITHUB_SSH_CONFIG}")
             msg.custom("    SSH config configured for GitHub!", color.green)
             return True
         except Exception as e:
@@ -301,7 +370,7 @@ class GitHubSSHSetup:
         }
         try:
             for cmd, desc in steps:
-                result = Executor().execute_cmd(
+                result = self.executor.execute_cmd(
                     cmd, cwd=project_dir, message=desc, env=ssh_env
                 )
                 if not result.success:
@@ -322,9 +391,8 @@ class GitHubSSHSetup:
         if not email:
             return True
 
-        ssh_dir = Path.home() / ".ssh"
-        ssh_dir.mkdir(mode=0o700, exist_ok=True)
-        ssh_key_path = ssh_dir / "github"
+        SSH_DIR.mkdir(mode=0o700, exist_ok=True)
+        ssh_key_path = SSH_DIR / "github"
 
         if not self.generate_ssh_key(ssh_key_path, email):
             return False
@@ -344,17 +412,23 @@ class GitHubSSHSetup:
             )
 
             if overwrite in ["y", "yes"]:
-                for key in existing_ids:
-                    if not self.delete_github_key(key):
-                        return False
+                # Each delete is a separate gh call and API round-trip
+                workers = min(10, len(existing_ids))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    deleted = list(pool.map(self.delete_github_key, existing_ids))
+                if not all(deleted):
+                    return False
             else:
                 msg.custom("    SSH key upload skipped.", color.yellow)
                 return True
 
-        if not self.upload_ssh_key_to_github(
-            ssh_key_path.with_suffix(".pub"),
-            hostname,
-        ):
-            return False
-
-        return self.configure_ssh_config()
+        # Writing ~/.ssh/config is local and does not depend on the upload,
+        # so it runs while the upload waits on GitHub
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            uploaded = pool.submit(
+                self.upload_ssh_key_to_github,
+                ssh_key_path.with_suffix(".pub"),
+                hostname,
+            )
+            configured = pool.submit(self.configure_ssh_config)
+            return all([uploaded.result(), configured.result()])
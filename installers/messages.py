@@ -2,34 +2,100 @@
 Colored message printing utilities for terminal output.
 
 This module provides colored console output functionality with ANSI escape codes.
+Colors are dropped when stdout is not a terminal or NO_COLOR is set.
 """
 
+import os
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Serializes output so messages from concurrent installers never interleave
+_lock = threading.Lock()
+
+# Per-thread list of pending lines while inside message.batch()
+_local = threading.local()
+
+
+def _write(line: str) -> None:
+    """Write a complete, newline-terminated message while holding the output lock."""
+    buffer = getattr(_local, "buffer", None)
+    if buffer is not None:
+        buffer.append(line)
+        return
+    # sys.stdout is looked up per call so redirection and capture keep working
+    with _lock:
+        sys.stdout.write(line)
+
+
+# Decided once at import: piped or redirected output gets plain text
+USE_COLOR = (
+    sys.stdout is not None and sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+)
+
+
+def _sgr(code: str) -> str:
+    """The escape sequence for an SGR code, or "" when colors are off."""
+    return f"\033[{code}m" if USE_COLOR else ""
+
+
+# Standard colors
+BLACK = _sgr("30")
+RED = _sgr("31")
+GREEN = _sgr("32")
+ORANGE = _sgr("33")
+BLUE = _sgr("34")
+PURPLE = _sgr("35")
+CYAN = _sgr("36")
+WHITE = _sgr("37")
+
+# Light colors
+LIGHTRED = _sgr("91")
+LIGHTGREEN = _sgr("92")
+YELLOW = _sgr("93")
+LIGHTBLUE = _sgr("94")
+PINK = _sgr("95")
+LIGHTCYAN = _sgr("96")
+
+# Formatting
+RESET = _sgr("0")
+BOLD = _sgr("1")
+UNDERLINE = _sgr("4")
+
+
+@lru_cache(maxsize=64)
+def _bar(n: int, sep: str, clr: str) -> str:
+    """A colored separator bar; the few (n, sep, clr) combinations are reused."""
+    return clr + n * sep + RESET
+
 
 class color:
-    """ANSI color codes for terminal output."""
+    """ANSI color codes for terminal output, grouped under one name."""
 
     # Standard colors
-    black: str = "\033[30m"
-    red: str = "\033[31m"
-    green: str = "\033[32m"
-    orange: str = "\033[33m"
-    blue: str = "\033[34m"
-    purple: str = "\033[35m"
-    cyan: str = "\033[36m"
-    white: str = "\033[37m"
+    black: str = BLACK
+    red: str = RED
+    green: str = GREEN
+    orange: str = ORANGE
+    blue: str = BLUE
+    purple: str = PURPLE
+    cyan: str = CYAN
+    white: str = WHITE
 
     # Light colors
-    lightred: str = "\033[91m"
-    lightgreen: str = "\033[92m"
-    yellow: str = "\033[93m"
-    lightblue: str = "\033[94m"
-    pink: str = "\033[95m"
-    lightcyan: str = "\033[96m"
+    lightred: str = LIGHTRED
+    lightgreen: str = LIGHTGREEN
+    yellow: str = YELLOW
+    lightblue: str = LIGHTBLUE
+    pink: str = PINK
+    lightcyan: str = LIGHTCYAN
 
     # Formatting
-    reset: str = "\033[0m"
-    bold: str = "\033[1m"
-    underline: str = "\033[4m"
+    reset: str = RESET
+    bold: str = BOLD
+    underline: str = UNDERLINE
 
 
 class message:
@@ -38,54 +104,86 @@ class message:
     @classmethod
     def error(cls, msg: str) -> None:
         """Print an error message in red."""
-        print(color.lightred + msg + color.reset)
+        _write(f"{LIGHTRED}{msg}{RESET}\n")
 
     @classmethod
     def warning(cls, msg: str) -> None:
         """Print a warning message in yellow."""
-        print(color.yellow + msg + color.reset)
+        _write(f"{YELLOW}{msg}{RESET}\n")
 
     @classmethod
     def success(cls, msg: str) -> None:
         """Print a success message in green."""
-        print(color.green + msg + color.reset)
+        _write(f"{GREEN}{msg}{RESET}\n")
 
     @classmethod
-    def custom(cls, s: str, clr: str = color.white) -> None:
+    def custom(cls, s: str, clr: str = WHITE) -> None:
         """Print a custom message with specified color."""
-        print(clr + s + color.reset)
+        _write(f"{clr}{s}{RESET}\n")
+
+    @classmethod
+    @contextmanager
+    def batch(cls) -> Iterator[None]:
+        """Hold this thread's messages and write them in one go on exit."""
+        if getattr(_local, "buffer", None) is not None:
+            yield  # nested: the outermost batch writes everything
+            return
+        _local.buffer = []
+        try:
+            yield
+        finally:
+            lines, _local.buffer = _local.buffer, None
+            if lines:
+                with _lock:
+                    sys.stdout.write("".join(lines))
+
+    @classmethod
+    def line(cls, *segments: tuple[str, str]) -> None:
+        """Print (text, color) segments on one line with one reset at the end.
+
+        A color code is written only where the color changes, as a single
+        combined SGR sequence that also resets the previous attributes.
+        """
+        parts = []
+        current = None
+        for text, clr in segments:
+            if clr != current:
+                # An uncolored segment after a colored one needs a plain reset
+                parts.append(f"\033[0;{clr[2:-1]}m" if clr else RESET)
+                current = clr
+            parts.append(text)
+        parts.append(RESET + "\n")
+        _write("".join(parts))
 
     @classmethod
-    def separator(cls, n: int = 20, sep: str = "-", clr: str = color.white) -> None:
+    def separator(cls, n: int = 20, sep: str = "-", clr: str = WHITE) -> None:
         """Print a separator line."""
-        print(clr + n * sep + color.reset)
+        _write(f"{_bar(n, sep, clr)}\n")
 
     @classmethod
-    def inseparator(
-        cls, s: str, n: int = 20, sep: str = "-", clr: str = color.white
-    ) -> None:
+    def inseparator(cls, s: str, n: int = 20, sep: str = "-", clr: str = WHITE) -> None:
         """Print text surrounded by separator lines."""
-        print(clr + n * sep)
-        print(s)
-        print(n * sep + color.reset)
+        bar = _bar(n, sep, clr)
+        _write(f"{bar}\n{clr}{s}{RESET}\n{bar}\n")
 
 
 if __name__ == "__main__":
-    message.error("error message")
-    message.warning("warning message")
-    message.success("success message")
-    message.separator()
-    message.custom("custom message")
-    message.custom("custom message", color.red)
-    message.custom("custom message", color.green)
-    message.custom("custom message", color.orange)
-    message.custom("custom message", color.blue)
-    message.custom("custom message", color.purple)
-    message.custom("custom message", color.cyan)
-    message.custom("custom message", color.white)
-    message.custom("custom message", color.lightred)
-    message.custom("custom message", color.lightgreen)
-    message.custom("custom message", color.yellow)
-    message.custom("custom message", color.lightblue)
-    message.custom("custom message", color.pink)
-    message.custom("custom message", color.lightcyan)
+    with message.batch():
+        message.error("error message")
+        message.warning("warning message")
+        message.success("success message")
+        message.separator()
+        message.custom("custom message")
+        message.custom("custom message", color.red)
+        message.custom("custom message", color.green)
+        message.custom("custom message", color.orange)
+        message.custom("custom message", color.blue)
+        message.custom("custom message", color.purple)
+        message.custom("custom message", color.cyan)
+        message.custom("custom message", color.white)
+        message.custom("custom message", color.lightred)
+        message.custom("custom message", color.lightgreen)
+        message.custom("custom message", color.yellow)
+        message.custom("custom message", color.lightblue)
+        message.custom("custom message", color.pink)
+        message.custom("custom message", color.lightcyan)
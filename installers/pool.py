@@ -0,0 +1,33 @@
+"""Shared worker pool for running independent installs concurrently."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(max_workers: int | None = None) -> ThreadPoolExecutor:
+    """Return the shared pool, creating it on first use.
+
+    max_workers only applies when the pool is created and defaults to the
+    number of CPUs.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=max_workers or os.cpu_count() or 1,
+                thread_name_prefix="installer",
+            )
+        return _pool
+
+
+def shutdown_pool(cancel_futures: bool = False) -> None:
+    """Wait for the shared pool to finish; the next get_pool() starts a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=cancel_futures)
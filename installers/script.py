@@ -8,11 +8,12 @@ from .base import Installer
 from .tools import Executor
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ScriptInstaller(Installer):
     """Handles installation from git repositories with installer scripts."""
 
     script_url: str = ""
+    sha256: str = ""
 
     def _install(self) -> bool:
         """
@@ -35,5 +36,6 @@ class ScriptInstaller(Installer):
         result = Executor().install_from_url(
             self.script_url,
             message=f"Starting {self.name} installation",
+            sha256=self.sha256,
         )
         return result.success
@@ -1,93 +1,137 @@
 """Source installer for tools that need to be built from source code."""
 
+import hashlib
+import os
+import shutil
 import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass, field
+from typing import ClassVar
 import logging
 
 from .messages import message as msg
 from .messages import color
 from .base import Installer
-from .tools import Executor
+from .tools import Executor, tildify
 
 
 logger = logging.getLogger(__name__)
 
+# Extracted source trees are kept here between runs, one directory per archive
+CACHE_DIR = Path.home() / ".cache" / "shell-installer"
 
-@dataclass(kw_only=True)
+# Marks a cache entry whose extraction completed
+CACHE_SENTINEL = ".extracted"
+
+# ccache does not expand "~" itself, so this is spelled out in full
+CCACHE_DIR = Path.home() / ".cache" / "shell-ccache"
+
+
+def _tree_size(path: Path) -> int:
+    """Total size in bytes of the files under path, not following symlinks."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+@dataclass(kw_only=True, slots=True)
 class SourceInstaller(Installer):
     """Handles installation from source code."""
 
     version: str = ""
     archive_pattern: str = ""
     binary_name: str = ""
+    sha256: str = ""
     configure_args: list = field(default_factory=list)
     run_autogen: bool = False
+    build_jobs: int | None = None  # defaults to the number of CPUs
+    parallel_install: bool = False  # not every Makefile's install is -j safe
+    use_ccache: bool = True  # compile through ccache when it is on PATH
+    _archive_url: str = field(default="", init=False, repr=False)
+    _archive_error: str = field(default="", init=False, repr=False)
+    _cache_key: str = field(default="", init=False, repr=False)
+    _display_path: str = field(default="", init=False, repr=False)
+
+    parallel_safe: ClassVar[bool] = True
+
+    # Least recently used cache entries are evicted beyond this many bytes
+    max_cache_bytes: ClassVar[int] = 2 * 1024**3
+
+    # Cache entries being built right now, which eviction must not touch
+    _cache_in_use: ClassVar[set[Path]] = set()
+    _cache_lock: ClassVar[threading.Lock] = threading.Lock()
 
     def __post_init__(self):
         """Post-init setup."""
 
+        # Installer.__post_init__ expands and creates installation_path
         if not self.installation_path:
             self.installation_path = Path.home() / "local/"
-        else:
-            self.installation_path = Path(self.installation_path).expanduser()
 
         self.check_cmd = self.binary_name
-        self.required_deps.extend(["wget", "tar"])
 
-        super().__post_init__()
+        if not self.build_jobs:
+            self.build_jobs = max(1, os.cpu_count() or 1)
+
+        # Format the URL up front; a bad pattern is reported when installing
+        try:
+            self._archive_url = self.archive_pattern.format(version=self.version)
+        except (KeyError, IndexError, ValueError) as e:
+            self._archive_error = f"{type(e).__name__}: {e}"
+        # A checksum added later must not trust a tree extracted without one
+        cache_id = f"{self._archive_url}\0{self.sha256.lower()}"
+        url_key = hashlib.sha256(cache_id.encode()).hexdigest()[:16]
+        self._cache_key = f"{self.name}-{self.version}-{url_key}"
+
+        super(SourceInstaller, self).__post_init__()
+
+        self._display_path = tildify(self.installation_path)
+
+    def share_cpus(self, concurrent_builds: int) -> None:
+        """Divide build_jobs between this many builds running at the same time."""
+        self.build_jobs = max(1, self.build_jobs // concurrent_builds)
 
     def _install(self) -> bool:
         """Install a tool from source code."""
-        try:
-            url = self.archive_pattern.format(version=self.version)
-        except ValueError as e:
-            msg.error(f"    Invalid archive pattern:\n    {e}")
+        if self._archive_error:
+            msg.error(f"    Invalid archive pattern:\n    {self._archive_error}")
             return False
+        url = self._archive_url
 
         msg.custom(
             f"    Installing {self.binary_name} from source:\n    {url}", color.orange
         )
 
         if self.dry_run:
-            display_path = str(self.installation_path).replace(str(Path.home()), "~")
             msg.custom(
                 (
                     "    Would configure, build, and install "
-                    f"{self.binary_name} to {display_path}"
+                    f"{self.binary_name} to {self._display_path}"
                 ),
                 color.cyan,
             )
             return True
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
+        with self._cache_entry() as cache_entry:
+            build_root = None
             try:
-                msg.custom(f"    Downloading {self.name} source...", color.cyan)
-
-                result = Executor().execute_cmd(
-                    ["wget", "-q", "-O", str(temp_path / f"{self.name}.tar.gz"), url],
-                    cwd=temp_path,
-                    message=f"{self.name} download started",
-                )
-
-                if not result.success:
+                if not self._fetch_source(url, cache_entry):
                     return False
 
-                result = Executor().execute_cmd(
-                    ["tar", "-xzf", f"{self.name}.tar.gz"],
-                    cwd=temp_path,
-                    message=f"{self.name} source extraction started",
-                )
-
-                if not result.success:
-                    return False
+                build_env = self._build_env()
 
                 # Find extracted source directory
                 extracted_dirs = [
                     d
-                    for d in temp_path.iterdir()
+                    for d in cache_entry.iterdir()
                     if d.is_dir() and d.name.startswith(self.name)
                 ]
                 if not extracted_dirs:
@@ -95,7 +139,14 @@ class SourceInstaller(Installer):
                         f"Could not find extracted {self.name} source directory"
                     )
 
-                source_dir = extracted_dirs[0]
+                # Build in a scratch copy so the cached tree stays pristine and
+                # build products never count against max_cache_bytes
+                pristine = extracted_dirs[0]
+                build_root = Path(
+                    tempfile.mkdtemp(prefix=f".build-{self.name}-", dir=CACHE_DIR)
+                )
+                source_dir = build_root / pristine.name
+                shutil.copytree(pristine, source_dir, symlinks=True)
 
                 # Run autogen.sh if needed
                 if self.run_autogen:
@@ -118,6 +169,7 @@ class SourceInstaller(Installer):
                     configure_cmd,
                     cwd=source_dir,
                     message=f"{self.name} configure started",
+                    env=build_env,
                 )
 
                 if not result.success:
@@ -126,25 +178,28 @@ class SourceInstaller(Installer):
                 # Build
                 msg.custom(f"    Building {self.name}...", color.cyan)
                 result = Executor().execute_cmd(
-                    ["make"],
+                    ["make", f"-j{self.build_jobs}"],
                     cwd=source_dir,
                     message=f"{self.name} build started",
+                    env=build_env,
                 )
 
                 if not result.success:
                     return False
 
                 # Install
-                display_path = str(self.installation_path)
-                display_path = display_path.replace(str(Path.home()), "~")
-
                 msg.custom(
-                    f"    Installing {self.name} to {display_path}...", color.cyan
+                    f"    Installing {self.name} to {self._display_path}...",
+                    color.cyan,
                 )
+                install_cmd = ["make", "install"]
+                if self.parallel_install:
+                    install_cmd.append(f"-j{self.build_jobs}")
                 result = Executor().execute_cmd(
-                    ["make", "install"],
+                    install_cmd,
                     cwd=source_dir,
                     message=f"{self.name} install started",
+                    env=build_env,
                 )
 
                 if not result.success:
@@ -156,3 +211,97 @@ class SourceInstaller(Installer):
                 logger.error(f"Error during {self.name} installation: {e}")
                 msg.error(f"    Installation failed: {e}")
                 return False
+            finally:
+                if build_root is not None:
+                    shutil.rmtree(build_root, ignore_errors=True)
+
+    def _build_env(self) -> dict[str, str] | None:
+        """Environment routing CC/CXX through ccache, or None to inherit ours."""
+        if not self.use_ccache or not shutil.which("ccache"):
+            return None
+
+        env = dict(os.environ)
+        for var, compiler in (("CC", "gcc"), ("CXX", "g++")):
+            current = env.get(var, compiler)
+            if not current.startswith("ccache "):
+                env[var] = f"ccache {current}"
+        env.setdefault("CCACHE_DIR", str(CCACHE_DIR))
+        env.setdefault("CCACHE_COMPRESS", "1")
+        env.setdefault("CCACHE_MAXSIZE", "5G")
+        return env
+
+    @contextmanager
+    def _cache_entry(self) -> Iterator[Path]:
+        """Yield this archive's cache directory, protected from eviction."""
+        entry = CACHE_DIR / self._cache_key
+        with self._cache_lock:
+            self._cache_in_use.add(entry)
+        try:
+            yield entry
+        finally:
+            with self._cache_lock:
+                self._cache_in_use.discard(entry)
+            self._evict_cache()
+
+    def _fetch_source(self, url: str, entry: Path) -> bool:
+        """Download and extract url into entry, unless an earlier run already did."""
+        if (entry / CACHE_SENTINEL).exists():
+            msg.custom(f"    Using cached {self.name} source", color.cyan)
+            os.utime(entry)  # most recently used, for eviction
+            return True
+
+        msg.custom(f"    Downloading {self.name} source...", color.cyan)
+
+        # Extract beside the entry and rename it into place when complete, so
+        # an interrupted download never looks like a usable cache entry
+        staging = entry.with_name(entry.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        result = Executor().download_and_extract(
+            url,
+            cwd=staging,
+            message=f"{self.name} download and extraction started",
+            sha256=self.sha256,
+        )
+        if not result.success:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+
+        shutil.rmtree(entry, ignore_errors=True)
+        staging.rename(entry)
+        # Marked complete only once renamed, where _cache_in_use protects it
+        (entry / CACHE_SENTINEL).touch()
+        return True
+
+    @classmethod
+    def _evict_cache(cls) -> None:
+        """Remove least recently used entries until the cache fits max_cache_bytes."""
+        with cls._cache_lock:
+            try:
+                # Staging and scratch build directories are never entries
+                entries = [
+                    e
+                    for e in CACHE_DIR.iterdir()
+                    if not e.name.endswith(".tmp")
+                    and not e.name.startswith(".build-")
+                    and (e / CACHE_SENTINEL).exists()
+                ]
+            except FileNotFoundError:
+                return
+
+            sizes = {e: _tree_size(e) for e in entries}
+            total = sum(sizes.values())
+            for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+                if total <= cls.max_cache_bytes:
+                    break
+                if entry in cls._cache_in_use:
+                    continue
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= sizes[entry]
+                logger.info(f"Evicted cached source {entry}")
+
+    @classmethod
+    def purge_cache(cls) -> None:
+        """Delete every cached source tree."""
+        with cls._cache_lock:
+            shutil.rmtree(CACHE_DIR, ignore_errors=True)
@@ -1,8 +1,10 @@
 """Symlinker installer for handling file and directory symlink operations."""
 
-import re
+import fcntl
+import os
 import shutil
-from datetime import datetime
+import stat
+import time
 from pathlib import Path
 from dataclasses import dataclass, field
 import logging
@@ -10,11 +12,59 @@ import logging
 from .messages import message as msg
 from .messages import color
 from .base import Installer
+from .tools import tildify
 
 logger = logging.getLogger(__name__)
 
+# Taken once per run so every backup made by this process shares one directory.
+RUN_TIMESTAMP = time.strftime("%Y-%m-%d-%H%M%S")
 
-@dataclass(kw_only=True)
+
+class _SafeChars(dict):
+    """str.translate table replacing all but word characters, "-" and "." by "_".
+
+    Entries are filled in on first sight, so the table covers all of Unicode
+    like the regex it replaces without being built up front.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        safe = char if char.isalnum() or char in "_-." else "_"
+        self[codepoint] = safe
+        return safe
+
+
+_SAFE_CHARS = _SafeChars()
+
+# ioctl from linux/fs.h that shares a file's extents with another (a reflink)
+FICLONE = 0x40049409
+
+
+def _clone_or_copy(src: str | Path, dst: str | Path) -> str | Path:
+    """copy2 that clones the data instead where the filesystem supports it.
+
+    On btrfs, XFS and similar a reflink backup costs a metadata update rather
+    than a full copy; elsewhere the ioctl fails and copy2 does the work.
+    """
+    # Only regular files can be cloned; opening a FIFO here would block,
+    # while copy2 rejects it and other special files with an error
+    try:
+        is_regular = stat.S_ISREG(os.stat(src).st_mode)
+    except OSError:
+        is_regular = False
+    if not is_regular:
+        return shutil.copy2(src, dst)
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError:
+        return shutil.copy2(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
+@dataclass(kw_only=True, slots=True)
 class SymlinkerInstaller(Installer):
     """
     Handles symlinking operations for files and directories.
@@ -47,16 +97,20 @@ class SymlinkerInstaller(Installer):
     backup_dir: Path = field(default_factory=lambda: Path(".install.bak"))
     operations_log: list = field(default_factory=list)
     required_deps: list[str] = field(default_factory=list)  # No external dependencies
+    _source_root: Path = field(default=Path(), init=False, repr=False)
+    _made_dirs: set[Path] = field(default_factory=set, init=False, repr=False)
 
     def __post_init__(self):
         """Initialize backup directory after dataclass initialization."""
-        super().__post_init__()
+        super(SymlinkerInstaller, self).__post_init__()
         self.backup_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Resolved once; every backup and symlink of this component uses it
+        self._source_root = Path(self.source).expanduser().resolve()
 
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize component name for safe use in filenames."""
         # Replace unsafe characters with underscores
-        return re.sub(r"[^\w\-.]", "_", name)
+        return name.translate(_SAFE_CHARS)
 
     def _is_broken_symlink(self, path: Path) -> bool:
         """Check if a path is a broken symlink."""
@@ -77,14 +131,36 @@ class SymlinkerInstaller(Installer):
         # Handle expand pattern - contents of source go into target
         if self.expand:
             success = True
-            for item in source_path.iterdir():
-                target = target_path / item.name
-                if not self.create_symlink(item, target):
-                    success = False
+            with os.scandir(source_path) as it:
+                entries = list(it)
+
+            # Every link goes into target_path: open it once and work
+            # relative to it, so the kernel walks its path only once
+            dir_fd = None
+            if not self.dry_run:
+                target_path.mkdir(parents=True, exist_ok=True)
+                self._made_dirs.add(target_path)
+                dir_fd = os.open(target_path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                for entry in entries:
+                    target = target_path / entry.name
+                    # Below the resolved root only an entry that is itself a
+                    # link can resolve elsewhere; skip realpath for the rest
+                    if entry.is_symlink():
+                        source = Path(entry.path).resolve()
+                    else:
+                        source = self._source_root / entry.name
+                    if not self.create_symlink(
+                        source, target, resolved=True, dir_fd=dir_fd
+                    ):
+                        success = False
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
             return success
         # Handle direct mapping - source to target
         else:
-            return self.create_symlink(source_path, target_path)
+            return self.create_symlink(self._source_root, target_path, resolved=True)
 
     def backup_file(
         self,
@@ -99,14 +175,13 @@ class SymlinkerInstaller(Installer):
         if not system_path.exists():
             return None
 
-        timestamp = datetime.now().strftime("%Y-%m-%d-%H%M%S")
-        backup_timestamp_dir = self.backup_dir / timestamp
+        backup_timestamp_dir = self.backup_dir / RUN_TIMESTAMP
         backup_timestamp_dir.mkdir(parents=True, exist_ok=True)
 
         # Use source_path to determine backup structure
         if source_path is not None:
             if source_root is None:
-                source_root = Path(self.source).expanduser().resolve()
+                source_root = self._source_root
             try:
                 rel_path = source_path.expanduser().resolve().relative_to(source_root)
             except ValueError:
@@ -127,20 +202,30 @@ class SymlinkerInstaller(Installer):
             if system_path.is_symlink():
                 real_path = system_path.resolve()
                 if real_path.is_dir():
-                    shutil.copytree(real_path, backup_path, symlinks=False)
+                    shutil.copytree(
+                        real_path,
+                        backup_path,
+                        symlinks=False,
+                        copy_function=_clone_or_copy,
+                    )
                     logger.info(
                         f"Backed up dereferenced directory {real_path} to {backup_path}"
                     )
                 else:
-                    shutil.copy2(real_path, backup_path)
+                    _clone_or_copy(real_path, backup_path)
                     logger.info(
                         f"Backed up dereferenced file {real_path} to {backup_path}"
                     )
             elif system_path.is_dir():
-                shutil.copytree(system_path, backup_path, symlinks=False)
+                shutil.copytree(
+                    system_path,
+                    backup_path,
+                    symlinks=False,
+                    copy_function=_clone_or_copy,
+                )
                 logger.info(f"Backed up directory {system_path} to {backup_path}")
             else:
-                shutil.copy2(system_path, backup_path)
+                _clone_or_copy(system_path, backup_path)
                 logger.info(f"Backed up file {system_path} to {backup_path}")
 
             msg.warning(f"    Backed up {system_path.name} to {backup_path}")
@@ -150,17 +235,30 @@ class SymlinkerInstaller(Installer):
             logger.error(f"Failed to backup {system_path}: {e}")
             return None
 
-    def create_symlink(self, source: Path, target: Path) -> bool:
-        """Create symbolic link with proper error handling."""
-        source = source.expanduser().resolve()
+    def create_symlink(
+        self,
+        source: Path,
+        target: Path,
+        resolved: bool = False,
+        dir_fd: int | None = None,
+    ) -> bool:
+        """Create symbolic link with proper error handling.
+
+        Pass resolved=True when source is already an absolute, resolved path,
+        and dir_fd when it is an open descriptor of the target's parent.
+        """
+        if not resolved:
+            source = source.expanduser().resolve()
         target_expanded = target.expanduser()
+        # The link's own syscalls go through dir_fd when the caller has one
+        link = target_expanded.name if dir_fd is not None else target_expanded
 
-        source_root = Path(self.source).expanduser().resolve().parent
+        source_root = self._source_root.parent
 
         logger.info(f"Creating symlink: {target_expanded} -> {source}")
 
-        target_display = str(target_expanded).replace(str(Path.home()), "~")
-        source_display = str(source).replace(str(Path.home()), "~")
+        target_display = tildify(target_expanded)
+        source_display = tildify(source)
 
         if self.dry_run:
             msg.custom(f"\n    {target_display} -> {source_display}", color.yellow)
@@ -168,10 +266,29 @@ class SymlinkerInstaller(Installer):
         else:
             msg.custom(f"\n    {target_display} -> {source_display}", color.yellow)
 
+        # Re-runs: a link that already names the source needs nothing else
+        try:
+            already_linked = os.readlink(link, dir_fd=dir_fd) == str(source)
+        except OSError:
+            already_linked = False
+        if already_linked:
+            msg.warning(
+                f"    Symlink {target_expanded.name} already points to source\n"
+            )
+            logger.info(f"Symlink {target_expanded} already points to {source}")
+            return True
+
+        # One lstat tells whether anything is there and whether it is a link
+        try:
+            target_mode = os.lstat(link, dir_fd=dir_fd).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            target_mode = None
+        target_is_link = target_mode is not None and stat.S_ISLNK(target_mode)
+
         # Remove existing file/symlink
-        if target_expanded.exists() or target_expanded.is_symlink():
+        if target_mode is not None:
             # Check if existing symlink is broken
-            if self._is_broken_symlink(target_expanded):
+            if target_is_link and self._is_broken_symlink(target_expanded):
                 msg.warning(
                     f"    Found broken symlink {target_expanded.name}, "
                     "removing without backup\n"
@@ -183,7 +300,7 @@ class SymlinkerInstaller(Installer):
             else:
                 # Check if existing symlink already points to our source
                 should_backup = True
-                if target_expanded.is_symlink():
+                if target_is_link:
                     try:
                         existing_target = target_expanded.readlink().resolve()
                         if existing_target == source:
@@ -218,19 +335,23 @@ class SymlinkerInstaller(Installer):
                         return False
 
                 # Only remove original after successful backup (or no backup needed)
-                if target_expanded.is_symlink():
+                if target_is_link:
                     target_expanded.unlink()
-                elif target_expanded.is_dir():
+                elif stat.S_ISDIR(target_mode):
                     shutil.rmtree(target_expanded)
                 else:
                     target_expanded.unlink()
 
-        # Create parent directory if needed (resolve parent path to avoid issues)
-        parent_dir = target_expanded.parent.resolve()
-        parent_dir.mkdir(parents=True, exist_ok=True)
+        # Create parent directory if needed; expanded components share one
+        # parent, so each is created only once. mkdir follows any links in
+        # the path itself, so the parent is not resolved first.
+        parent = target_expanded.parent
+        if parent not in self._made_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(parent)
 
         try:
-            target_expanded.symlink_to(source)
+            os.symlink(source, link, dir_fd=dir_fd)
             self.operations_log.append(
                 {
                     "action": "symlink",
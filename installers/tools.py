@@ -1,23 +1,122 @@
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
+import hashlib
 import subprocess
 import logging
+import shutil
+import ssl
+import tarfile
 import tempfile
+import threading
+import urllib.request
 from textwrap import indent
 
+try:  # optional: only needed for .tar.zst archives
+    import zstandard
+except ImportError:
+    zstandard = None
+
 from .messages import message as msg
 
 logger = logging.getLogger(__name__)
 
+HOME = str(Path.home())
+
+# Chunk size for copying archive members; large binaries need far fewer syscalls
+COPY_BUFSIZE = 1024 * 1024
+
+# Streamed command output is logged in records of about this many characters
+LOG_BLOCK_CHARS = 64 * 1024
+
+# Lines of a failed command's output shown to the user
+TAIL_LINES = 200
+
+
+@cache
+def _opener() -> urllib.request.OpenerDirector:
+    # urlopen() builds a new TLS context, reloading the CA bundle, for every
+    # HTTPS connection; one shared context loads it once per run.
+    context = ssl.create_default_context()
+    return urllib.request.build_opener(urllib.request.HTTPSHandler(context=context))
+
+
+# Resolved executables by (name, PATH); misses are not cached
+_executables: dict[tuple[str, str | None], str] = {}
+
+
+def _resolve_executable(name: str, path: str | None = None) -> str:
+    """Absolute path of a command name, so the child need not search PATH."""
+    if "/" in name:
+        return name
+    key = (name, path)
+    found = _executables.get(key)
+    if found is None:
+        found = shutil.which(name, path=path)
+        if found is None:
+            return name  # let exec report the missing command as before
+        _executables[key] = found
+    return found
+
+
+def open_url(url: str | urllib.request.Request, timeout: float = 60):
+    """Open url like urllib.request.urlopen, sharing one TLS context."""
+    return _opener().open(url, timeout=timeout)
+
+
+def tildify(path: Path | str) -> str:
+    """Shorten a path under the home directory to ~/... for display."""
+    s = str(path)
+    if s == HOME or s.startswith(HOME + "/"):
+        return "~" + s[len(HOME) :]
+    return s
+
+
+class ChecksumMismatch(Exception):
+    """A downloaded archive did not match its expected SHA-256 digest."""
 
-@dataclass
+
+class HashingReader:
+    """Read-through wrapper that feeds every chunk it returns into SHA-256."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        self.digest.update(chunk)
+        return chunk
+
+
+def _feed(pipe, text: str) -> None:
+    """Write text to a child's stdin and close it."""
+    try:
+        pipe.write(text)
+        pipe.close()
+    except BrokenPipeError:
+        # Exited without reading it; the exit status says why
+        with suppress(BrokenPipeError):
+            pipe.close()
+
+
+@dataclass(slots=True)
 class FailedCommand:
+    """A command that failed, with what it printed.
+
+    Streamed commands merge stderr into stdout and keep only the last
+    TAIL_LINES lines; that tail is then stored in both stdout and stderr.
+    """
+
     cmd: list[str] | str
     stdout: str
     stderr: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandResult:
     success: bool
     result: subprocess.CompletedProcess | FailedCommand | None
@@ -28,59 +127,261 @@ class Executor:
         pass
 
     def execute_cmd(
-        self, cmd: list[str] | str, message: str = "", **kwargs
+        self,
+        cmd: list[str] | str,
+        message: str = "",
+        capture_on_success: bool = False,
+        **kwargs,
     ) -> CommandResult:
-        """Execute a command and print output. Print stdout and stderr if it fails."""
+        """Execute a command and log its output. Print the output if it fails.
+
+        Output is streamed to the log as it arrives, with stderr merged into
+        stdout, and only its last TAIL_LINES lines are kept in memory. Set
+        capture_on_success when the caller needs the full stdout and stderr
+        in the returned CompletedProcess.
+
+        The command name is resolved against PATH once per run, and
+        preexec_fn is rejected so the child is always started through
+        CPython's vfork/posix_spawn path rather than a full fork.
+        """
 
         if any(key in kwargs for key in ["capture_output", "text", "check"]):
             raise ValueError("capture_output should not be in kwargs")
+        # preexec_fn forces a full fork() instead of CPython's vfork fast path
+        if "preexec_fn" in kwargs:
+            raise ValueError("preexec_fn is not supported")
 
-        logger.info("==============================================")
+        if isinstance(cmd, list) and cmd:
+            env = kwargs.get("env")
+            path = env.get("PATH") if env is not None else None
+            cmd = [_resolve_executable(cmd[0], path), *cmd[1:]]
+
+        record = ["=============================================="]
         if message:
-            logger.info(message)
-        logger.info(f"Executing command: {cmd}")
+            record.append(message)
+        record.append(f"Executing command: {cmd}")
 
+        try:
+            if capture_on_success:
+                return self._run_captured(cmd, record, **kwargs)
+            return self._run_streamed(cmd, record, **kwargs)
+        except OSError:
+            # The command could not be started; still record what was tried
+            logger.info("\n".join(record))
+            raise
+
+    def _run_captured(self, cmd, record: list[str], **kwargs) -> CommandResult:
         try:
             result = subprocess.run(
                 cmd, capture_output=True, text=True, check=True, **kwargs
             )
 
+            # Everything about one command goes to the log as a single record
             if result.stdout:
-                logger.info("STDOUT:\n%s", result.stdout)
+                record.append(f"STDOUT:\n{result.stdout}")
             if result.stderr:
-                logger.info("STDERR:\n%s", result.stderr)
-            logger.info("==============================================")
+                record.append(f"STDERR:\n{result.stderr}")
+            record.append("==============================================")
+            logger.info("\n".join(record))
 
             return CommandResult(True, result)
 
         except subprocess.CalledProcessError as e:
-            if e.stdout:
-                logger.info("STDOUT:\n%s", e.stdout)
-            if e.stderr:
-                logger.info("STDERR:\n%s", e.stderr)
-            logger.info("==============================================")
+            # Emit the captured output as one log record and one message
+            streams = [
+                (label, out)
+                for label, out in (("STDOUT", e.stdout), ("STDERR", e.stderr))
+                if out
+            ]
+            record.extend(f"{label}:\n{out}" for label, out in streams)
+            record.append("==============================================")
+            logger.info("\n".join(record))
 
             msg.error("    Command failed with message:")
-            if e.stdout:
-                msg.error(indent(e.stdout.strip(), "    "))
-            if e.stderr:
-                msg.error(indent(e.stderr.strip(), "    "))
+            if streams:
+                details = "\n".join(out.strip() for _, out in streams)
+                msg.error(indent(details, "    "))
 
             return CommandResult(False, FailedCommand(cmd, e.stdout, e.stderr))
 
+    def _run_streamed(self, cmd, record: list[str], **kwargs) -> CommandResult:
+        input_text = kwargs.pop("input", None)
+        tail = deque(maxlen=TAIL_LINES)
+
+        # Short outputs still end up as one record: the header, the output
+        # and the exit status are only split once a block fills up.
+        block = ["\n".join(record), "\nOUTPUT:\n"]
+        size = 0
+        with subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if input_text is not None else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            **kwargs,
+        ) as proc:
+            # Feed input from a thread, like communicate(), so a child that
+            # fills the output pipe before reading stdin cannot deadlock us
+            feeder = None
+            if input_text is not None:
+                feeder = threading.Thread(
+                    target=_feed, args=(proc.stdin, input_text), daemon=True
+                )
+                feeder.start()
+            for line in proc.stdout:
+                tail.append(line)
+                block.append(line)
+                size += len(line)
+                if size >= LOG_BLOCK_CHARS:
+                    logger.info("".join(block))
+                    block, size = [], 0
+            if feeder is not None:
+                feeder.join()
+
+        block.append(f"Exit status: {proc.returncode}\n")
+        block.append("==============================================")
+        logger.info("".join(block))
+
+        if proc.returncode == 0:
+            return CommandResult(True, subprocess.CompletedProcess(cmd, 0))
+
+        output = "".join(tail)
+        msg.error("    Command failed with message:")
+        if output.strip():
+            msg.error(indent(output.strip(), "    "))
+        return CommandResult(False, FailedCommand(cmd, output, output))
+
     def install_from_url(
         self,
         url: str,
         message: str = "Installing from remote script...",
+        sha256: str = "",
     ) -> CommandResult:
-        """Download script to a temp file then execute it — avoids shell=True."""
+        """Download script to a temp file then execute it — avoids shell=True.
+
+        With sha256 set, the script is only run if its digest matches.
+        """
+        self._log_download_start(url, message)
         with tempfile.NamedTemporaryFile(suffix=".sh", delete=False) as f:
             tmp = Path(f.name)
+            try:
+                with open_url(url) as response:
+                    reader = HashingReader(response)
+                    shutil.copyfileobj(reader, f, length=COPY_BUFSIZE)
+                actual = reader.digest.hexdigest()
+                if sha256 and actual != sha256.lower():
+                    raise ChecksumMismatch(
+                        f"SHA-256 mismatch: expected {sha256}, got {actual}"
+                    )
+            except (OSError, ChecksumMismatch) as e:
+                self._report_download_error(url, e)
+                tmp.unlink(missing_ok=True)
+                return CommandResult(
+                    False, FailedCommand(["download", url], "", str(e))
+                )
         try:
-            result = self.execute_cmd(["wget", "-qO", str(tmp), url], message=message)
-            if not result.success:
-                return result
+            # Run from a file rather than stdin so the script can still prompt
             tmp.chmod(0o700)
             return self.execute_cmd(["bash", str(tmp)], message=message)
         finally:
             tmp.unlink(missing_ok=True)
+
+    def download_and_extract(
+        self,
+        url: str,
+        cwd: Path,
+        message: str = "Downloading and extracting archive...",
+        sha256: str = "",
+    ) -> CommandResult:
+        """Stream a tarball over HTTP straight into tarfile, without wget or tar.
+
+        With sha256 set, the archive is hashed as it streams and the call
+        fails on a mismatch; the caller should then discard cwd.
+        """
+        self._log_download_start(url, message)
+        try:
+            with self._stream_archive(url, sha256) as archive:
+                archive.extractall(cwd, filter="data")
+        except (OSError, tarfile.TarError, ChecksumMismatch) as e:
+            self._report_download_error(url, e)
+            return CommandResult(False, FailedCommand(["download", url], "", str(e)))
+
+        logger.info("==============================================")
+        return CommandResult(True, None)
+
+    def extract_member(
+        self,
+        url: str,
+        dest: Path,
+        match: Callable[[tarfile.TarInfo], bool],
+        message: str = "Downloading archive...",
+        sha256: str = "",
+    ) -> CommandResult:
+        """Stream a tarball and write the first member `match` accepts to dest.
+
+        With sha256 set, the archive is hashed as it streams and the call
+        fails if the digest does not match.
+        """
+        self._log_download_start(url, message)
+        try:
+            with self._stream_archive(url, sha256) as archive:
+                for member in archive:
+                    if not match(member):
+                        continue
+                    with archive.extractfile(member) as src, open(dest, "wb") as dst:
+                        shutil.copyfileobj(src, dst, length=COPY_BUFSIZE)
+                    logger.info(f"Extracted {member.name} to {dest}")
+                    logger.info("==============================================")
+                    return CommandResult(True, None)
+        except (OSError, tarfile.TarError, ChecksumMismatch) as e:
+            self._report_download_error(url, e)
+            return CommandResult(False, FailedCommand(["download", url], "", str(e)))
+
+        logger.error(f"No matching member in {url}")
+        logger.info("==============================================")
+        return CommandResult(
+            False, FailedCommand(["download", url], "", "no matching member")
+        )
+
+    @contextmanager
+    def _stream_archive(self, url: str, sha256: str = "") -> Iterator[tarfile.TarFile]:
+        # "r|*" reads the response sequentially, so extraction overlaps
+        # the download and the archive itself is never written to disk.
+        # The compression (gzip, bzip2 or xz) is detected from the stream;
+        # tarfile has no zstd support, so .zst archives go through zstandard.
+        is_zstd = url.endswith((".zst", ".tzst"))
+        if is_zstd and zstandard is None:
+            raise tarfile.CompressionError(
+                "zstandard module is not installed; cannot extract .zst archives"
+            )
+        with open_url(url) as response:
+            reader = HashingReader(response)
+            if is_zstd:
+                fileobj = zstandard.ZstdDecompressor().stream_reader(reader)
+                mode = "r|"
+            else:
+                fileobj, mode = reader, "r|*"
+            with tarfile.open(fileobj=fileobj, mode=mode) as archive:
+                yield archive
+
+            if sha256:
+                # The caller may stop early; hash the rest of the archive too
+                while reader.read(COPY_BUFSIZE):
+                    pass
+                actual = reader.digest.hexdigest()
+                if actual != sha256.lower():
+                    raise ChecksumMismatch(
+                        f"SHA-256 mismatch: expected {sha256}, got {actual}"
+                    )
+
+    def _log_download_start(self, url: str, message: str) -> None:
+        record = ["=============================================="]
+        if message:
+            record.append(message)
+        record.append(f"Streaming {url}")
+        logger.info("\n".join(record))
+
+    def _report_download_error(self, url: str, error: Exception) -> None:
+        logger.error(f"Download of {url} failed: {error}")
+        logger.info("==============================================")
+        msg.error(f"    Download failed:\n    {url}\n    {error}")
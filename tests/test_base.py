@@ -1,4 +1,4 @@
-"""Tests for Installer base class: _check_installed and _check_dependencies."""
+"""Tests for Installer base class: setup, _check_installed and _check_dependencies."""
 
 import pytest
 from dataclasses import dataclass
@@ -19,6 +19,29 @@ def installer(tmp_path):
     )
 
 
+class TestInstallationPath:
+    def test_missing_path_is_created(self, tmp_path):
+        path = tmp_path / "a" / "b"
+        ConcreteInstaller(name="test-tool", installation_path=str(path))
+        assert path.is_dir()
+
+    def test_existing_dir_is_accepted(self, tmp_path):
+        ConcreteInstaller(name="test-tool", installation_path=str(tmp_path))
+        assert tmp_path.is_dir()
+
+    def test_file_path_raises(self, tmp_path):
+        path = tmp_path / "file"
+        path.touch()
+        with pytest.raises(NotADirectoryError):
+            ConcreteInstaller(name="test-tool", installation_path=str(path))
+
+    def test_path_under_file_raises(self, tmp_path):
+        path = tmp_path / "file"
+        path.touch()
+        with pytest.raises(NotADirectoryError):
+            ConcreteInstaller(name="test-tool", installation_path=str(path / "bin"))
+
+
 class TestCheckInstalled:
     def test_check_cmd_found_skips(self, installer):
         installer.check_cmd = "python3"
@@ -0,0 +1,193 @@
+"""Tests for BinaryInstaller: release asset resolution and installation."""
+
+import tarfile
+
+import pytest
+
+from installers import binary
+from installers.binary import BinaryInstaller
+
+ASSETS = [
+    "gh_2.74.2_checksums.txt",
+    "gh_2.74.2_linux_386.tar.gz",
+    "gh_2.74.2_linux_amd64.deb",
+    "gh_2.74.2_linux_amd64.tar.gz",
+    "gh_2.74.2_linux_arm64.tar.gz",
+    "gh_2.74.2_macOS_amd64.zip",
+]
+
+
+@pytest.fixture
+def installer(tmp_path, monkeypatch):
+    monkeypatch.setattr("platform.system", lambda: "Linux")
+    monkeypatch.setattr("platform.machine", lambda: "x86_64")
+    monkeypatch.setattr(binary, "DEFAULT_ASSET_RE", binary._default_asset_re())
+    monkeypatch.setattr(
+        BinaryInstaller,
+        "_releases",
+        {
+            ("cli/cli", "v2.74.2"): {
+                "assets": [
+                    {"name": name, "browser_download_url": f"https://dl/{name}"}
+                    for name in ASSETS
+                ]
+            }
+        },
+    )
+    return BinaryInstaller(
+        name="gh",
+        binary_name="gh",
+        version="2.74.2",
+        repo="cli/cli",
+        archive_pattern="https://fallback/{version}.tar.gz",
+        installation_path=str(tmp_path / "bin"),
+    )
+
+
+class TestResolveUrl:
+    def test_picks_platform_tarball(self, installer):
+        assert installer._resolve_url() == "https://dl/gh_2.74.2_linux_amd64.tar.gz"
+
+    def test_picks_arm64_alias(self, installer, monkeypatch):
+        monkeypatch.setattr("platform.machine", lambda: "aarch64")
+        monkeypatch.setattr(binary, "DEFAULT_ASSET_RE", binary._default_asset_re())
+        assert installer._resolve_url() == "https://dl/gh_2.74.2_linux_arm64.tar.gz"
+
+    def test_asset_pattern_overrides_default(self, installer):
+        installer.asset_pattern = r"_linux_386\.tar\.gz$"
+        assert installer._resolve_url() == "https://dl/gh_2.74.2_linux_386.tar.gz"
+
+    def test_no_match_falls_back_to_archive_pattern(self, installer):
+        installer.asset_pattern = r"\.rpm$"
+        assert installer._resolve_url() == "https://fallback/2.74.2.tar.gz"
+
+    def test_no_match_without_archive_pattern_reports_error(self, installer, capsys):
+        installer.asset_pattern = r"\.rpm$"
+        installer.archive_pattern = ""
+        assert installer._resolve_url() == ""
+        assert "no archive_pattern is set" in capsys.readouterr().out
+
+    def test_without_repo_uses_archive_pattern(self, installer):
+        installer.repo = ""
+        assert installer._resolve_url() == "https://fallback/2.74.2.tar.gz"
+
+    def test_records_asset_digest(self, installer):
+        assets = BinaryInstaller._releases[("cli/cli", "v2.74.2")]["assets"]
+        assets[3]["digest"] = "sha256:abc123"
+        installer._resolve_url()
+        assert installer._asset_sha256 == "abc123"
+
+    def test_asset_pattern_allows_quantifiers(self, installer):
+        installer.asset_pattern = r"_\d{1,3}\.tar\.gz$"
+        assert installer._resolve_url() == "https://dl/gh_2.74.2_linux_386.tar.gz"
+
+    def test_asset_pattern_version_is_literal(self, installer):
+        installer.asset_pattern = r"^gh_{version}_linux_arm64\.tar\.gz$"
+        assert installer._resolve_url() == "https://dl/gh_2.74.2_linux_arm64.tar.gz"
+
+    def test_invalid_asset_pattern_returns_empty(self, installer):
+        installer.asset_pattern = r"linux_(amd64"
+        assert installer._resolve_url() == ""
+
+    def test_invalid_archive_pattern_returns_empty(self, tmp_path):
+        installer = BinaryInstaller(
+            name="tool",
+            binary_name="tool",
+            version="1.0",
+            archive_pattern="https://x/{unknown}.tar.gz",
+            installation_path=str(tmp_path / "bin"),
+        )
+        assert installer._resolve_url() == ""
+
+
+@pytest.fixture
+def release_archive(tmp_path):
+    """A release-style archive with the tool in bin/ next to a same-named doc dir."""
+    root = tmp_path / "src" / "tool-1.0"
+    (root / "bin").mkdir(parents=True)
+    (root / "doc" / "tool").mkdir(parents=True)
+    (root / "bin" / "tool").write_text("#!/bin/sh\necho tool 1.0\n")
+    (root / "bin" / "tool").chmod(0o755)
+    path = tmp_path / "tool-1.0.tar.gz"
+    with tarfile.open(path, "w:gz") as tf:
+        tf.add(root, arcname="tool-1.0")
+    return path
+
+
+class TestInstall:
+    def test_dry_run_does_not_query_github(self, installer, monkeypatch):
+        def no_network(*args, **kwargs):
+            raise AssertionError("dry run must not hit the network")
+
+        monkeypatch.setattr(BinaryInstaller, "_releases", {})
+        monkeypatch.setattr(binary, "open_url", no_network)
+        installer.dry_run = True
+        assert installer._install() is True
+
+    def test_installs_binary_from_archive(self, release_archive, tmp_path):
+        target = tmp_path / "bin"
+        installer = BinaryInstaller(
+            name="tool",
+            binary_name="tool",
+            version="1.0",
+            archive_pattern=release_archive.as_uri(),
+            installation_path=str(target),
+        )
+        assert installer._install() is True
+        assert (target / "tool").stat().st_mode & 0o777 == 0o755
+        assert (target / ".tool.version").read_text() == "1.0"
+        assert not (target / ".tool.part").exists()
+
+    def test_checksum_mismatch_leaves_nothing(self, release_archive, tmp_path):
+        installer = BinaryInstaller(
+            name="tool",
+            binary_name="tool",
+            version="1.0",
+            archive_pattern=release_archive.as_uri(),
+            installation_path=str(tmp_path / "bin"),
+            sha256="0" * 64,
+        )
+        assert installer._install() is False
+        assert list((tmp_path / "bin").iterdir()) == []
+
+    def test_missing_binary_fails(self, release_archive, tmp_path):
+        installer = BinaryInstaller(
+            name="other",
+            binary_name="other",
+            version="1.0",
+            archive_pattern=release_archive.as_uri(),
+            installation_path=str(tmp_path / "bin"),
+        )
+        assert installer._install() is False
+        assert list((tmp_path / "bin").iterdir()) == []
+
+
+class TestInstalledVersion:
+    @pytest.fixture
+    def installer(self, tmp_path):
+        return BinaryInstaller(
+            name="tool",
+            binary_name="tool",
+            version="1.2",
+            installation_path=str(tmp_path),
+        )
+
+    def write_tool(self, path, output):
+        path.write_text(f"#!/bin/sh\necho '{output}'\n")
+        path.chmod(0o755)
+
+    def test_missing_binary_does_not_match(self, installer):
+        assert installer._installed_version_matches() is False
+
+    def test_exact_version_matches(self, installer, tmp_path):
+        self.write_tool(tmp_path / "tool", "tool version 1.2 (abc123)")
+        assert installer._installed_version_matches() is True
+
+    def test_version_prefix_does_not_match(self, installer, tmp_path):
+        self.write_tool(tmp_path / "tool", "tool 1.2.3")
+        assert installer._installed_version_matches() is False
+
+    def test_stamp_file_matches(self, installer, tmp_path):
+        self.write_tool(tmp_path / "tool", "no version here")
+        (tmp_path / ".tool.version").write_text("1.2")
+        assert installer._installed_version_matches() is True
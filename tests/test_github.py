@@ -1,8 +1,12 @@
-"""Tests for GitHubSSHSetup: setup_git_repo and get_email_for_key."""
+"""Tests for GitHubSSHSetup: authentication, key lookup, git repo setup and email."""
 
 import pytest
 from unittest.mock import MagicMock, patch
-from installers.custom.github import GitHubSSHSetup, _ssh_to_https_url
+from installers.custom.github import (
+    GitHubSSHSetup,
+    _file_contains,
+    _ssh_to_https_url,
+)
 
 
 SSH_URL = "git@github.com:test/repo.git"
@@ -38,6 +42,113 @@ class TestSshToHttpsUrl:
         assert _ssh_to_https_url(url) == url
 
 
+class TestFileContains:
+    def test_finds_needle(self, tmp_path):
+        path = tmp_path / "config"
+        path.write_text("Host example\n\nHost github.com\n    User git\n")
+        assert _file_contains(path, b"Host github.com") is True
+
+    def test_needle_absent(self, tmp_path):
+        path = tmp_path / "config"
+        path.write_text("Host example\n")
+        assert _file_contains(path, b"Host github.com") is False
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "config"
+        path.touch()
+        assert _file_contains(path, b"Host github.com") is False
+
+    def test_missing_file(self, tmp_path):
+        assert _file_contains(tmp_path / "config", b"Host github.com") is False
+
+
+class TestAuthenticateCli:
+    def test_already_authenticated_skips_prompt(self, setup, monkeypatch):
+        def fail_input(_):
+            raise AssertionError("should not prompt")
+
+        monkeypatch.setattr("builtins.input", fail_input)
+        with patch("installers.custom.github.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            assert setup.authenticate_cli() is True
+
+    def test_not_authenticated_prompts(self, setup, monkeypatch):
+        monkeypatch.setattr("builtins.input", lambda _: "")
+        with patch("installers.custom.github.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=1)
+            assert setup.authenticate_cli() is True
+        mock_run.assert_called_once()
+
+    def test_missing_gh_binary_is_not_authenticated(self, setup):
+        assert setup.is_authenticated() is False
+
+
+KEY_LIST = (
+    "laptop-10.0.0.2\tssh-ed25519 AAAA\t2024-01-01\t101\tauthentication\n"
+    "desktop-10.0.0.3\tssh-ed25519 BBBB\t2024-01-02\t102\tauthentication\n"
+    "laptop-10.0.0.2\tssh-ed25519 CCCC\t2024-01-03\t103\tauthentication\n"
+)
+
+
+class TestGetGithubKeyIdByTitle:
+    def test_lists_keys_once_for_repeated_lookups(self, setup):
+        listing = MagicMock(success=True, result=MagicMock(stdout=KEY_LIST))
+        with patch("installers.custom.github.Executor") as MockExecutor:
+            MockExecutor.return_value.execute_cmd.return_value = listing
+            assert setup.get_github_key_id_by_title("laptop-10.0.0.2") == [
+                "101",
+                "103",
+            ]
+            assert setup.get_github_key_id_by_title("desktop-10.0.0.3") == ["102"]
+            assert setup.get_github_key_id_by_title("other") == []
+        MockExecutor.return_value.execute_cmd.assert_called_once()
+
+    def test_delete_invalidates_cache(self, setup):
+        listing = MagicMock(success=True, result=MagicMock(stdout=KEY_LIST))
+        with patch("installers.custom.github.Executor") as MockExecutor:
+            MockExecutor.return_value.execute_cmd.return_value = listing
+            setup.get_github_key_id_by_title("laptop-10.0.0.2")
+            setup.delete_github_key("101")
+            setup.get_github_key_id_by_title("laptop-10.0.0.2")
+        assert MockExecutor.return_value.execute_cmd.call_count == 3
+
+
+class TestSetupSshKeyOverwrite:
+    @pytest.fixture
+    def ready(self, setup, monkeypatch, tmp_path):
+        monkeypatch.setattr("installers.custom.github.SSH_DIR", tmp_path / ".ssh")
+        monkeypatch.setattr("builtins.input", lambda _: "y")
+        monkeypatch.setattr(setup, "get_email_for_key", lambda: "me@example.com")
+        monkeypatch.setattr(setup, "generate_ssh_key", lambda *a: True)
+        monkeypatch.setattr(
+            setup, "get_github_key_id_by_title", lambda _: ["1", "2", "3"]
+        )
+        monkeypatch.setattr(setup, "upload_ssh_key_to_github", lambda *a: True)
+        monkeypatch.setattr(setup, "configure_ssh_config", lambda: True)
+        return setup
+
+    def test_deletes_every_duplicate(self, ready, monkeypatch):
+        deleted = []
+        monkeypatch.setattr(ready, "delete_github_key", lambda k: not deleted.append(k))
+        assert ready.setup_ssh_key() is True
+        assert sorted(deleted) == ["1", "2", "3"]
+
+    def test_failed_delete_aborts_upload(self, ready, monkeypatch):
+        monkeypatch.setattr(ready, "delete_github_key", lambda k: k != "2")
+        monkeypatch.setattr(
+            ready, "upload_ssh_key_to_github", MagicMock(return_value=True)
+        )
+        assert ready.setup_ssh_key() is False
+        ready.upload_ssh_key_to_github.assert_not_called()
+
+    def test_failed_upload_still_configures_ssh(self, ready, monkeypatch):
+        monkeypatch.setattr(ready, "delete_github_key", lambda k: True)
+        monkeypatch.setattr(ready, "upload_ssh_key_to_github", lambda *a: False)
+        monkeypatch.setattr(ready, "configure_ssh_config", MagicMock(return_value=True))
+        assert ready.setup_ssh_key() is False
+        ready.configure_ssh_config.assert_called_once()
+
+
 class TestSetupGitRepo:
     def test_already_git_repo_skips(self, setup, tmp_path):
         (tmp_path / ".git").mkdir()
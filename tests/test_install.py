@@ -0,0 +1,44 @@
+"""Tests for install.py: running installer steps."""
+
+import logging
+import threading
+
+from install import run_buffered
+from installers.messages import message as msg
+
+
+class TestRunBuffered:
+    def test_concurrent_steps_print_as_blocks(self, capsys):
+        both_started = threading.Barrier(2)
+
+        def step(name):
+            def run():
+                msg.custom(f"* {name}")
+                both_started.wait()  # the other step has printed its header too
+                msg.custom(f"{name} done")
+                return True
+
+            return run
+
+        logger = logging.getLogger("test_install")
+        threads = [
+            threading.Thread(target=run_buffered, args=(step(name), logger))
+            for name in ("one", "two")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines in (
+            ["* one", "one done", "* two", "two done"],
+            ["* two", "two done", "* one", "one done"],
+        )
+
+    def test_failure_is_reported(self, capsys):
+        def fail():
+            raise RuntimeError("boom")
+
+        assert run_buffered(fail, logging.getLogger("test_install")) is False
+        assert "unexpected error" in capsys.readouterr().out
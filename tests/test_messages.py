@@ -0,0 +1,100 @@
+"""Tests for installers.messages: colored terminal output."""
+
+import os
+import pty
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from installers.messages import GREEN, LIGHTRED, RED, RESET, message
+
+
+class TestLine:
+    def test_one_sgr_per_color_change(self, capsys):
+        message.line(("a", "\033[31m"), ("b", "\033[31m"), ("c", "\033[32m"))
+        assert capsys.readouterr().out == f"\033[0;31mab\033[0;32mc{RESET}\n"
+
+    def test_uncolored_segment_resets(self, capsys):
+        message.line(("a", "\033[31m"), ("b", ""), ("c", "\033[31m"))
+        expected = f"\033[0;31ma{RESET}b\033[0;31mc{RESET}\n"
+        assert capsys.readouterr().out == expected
+
+    def test_no_segments(self, capsys):
+        message.line()
+        assert capsys.readouterr().out == f"{RESET}\n"
+
+
+class TestSeparator:
+    def test_separator(self, capsys):
+        message.separator(3, "=", RED)
+        assert capsys.readouterr().out == f"{RED}==={RESET}\n"
+
+    def test_inseparator(self, capsys):
+        message.inseparator("title", 3, "-", GREEN)
+        bar = f"{GREEN}---{RESET}"
+        assert capsys.readouterr().out == f"{bar}\n{GREEN}title{RESET}\n{bar}\n"
+
+
+class TestLevels:
+    def test_error(self, capsys):
+        message.error("boom")
+        assert capsys.readouterr().out == f"{LIGHTRED}boom{RESET}\n"
+
+    def test_success(self, capsys):
+        message.success("done")
+        assert capsys.readouterr().out == f"{GREEN}done{RESET}\n"
+
+
+class TestBatch:
+    def test_writes_once_on_exit(self, capsys, monkeypatch):
+        writes = []
+        monkeypatch.setattr(sys.stdout, "write", writes.append)
+        with message.batch():
+            message.success("one")
+            message.success("two")
+            assert writes == []
+        assert writes == [f"{GREEN}one{RESET}\n{GREEN}two{RESET}\n"]
+
+    def test_nested_batches_flush_at_outermost(self, capsys):
+        with message.batch():
+            with message.batch():
+                message.success("inner")
+            assert capsys.readouterr().out == ""
+        assert capsys.readouterr().out == f"{GREEN}inner{RESET}\n"
+
+    def test_flushes_when_body_raises(self, capsys):
+        with pytest.raises(RuntimeError), message.batch():
+            message.success("before")
+            raise RuntimeError
+        assert capsys.readouterr().out == f"{GREEN}before{RESET}\n"
+
+
+class TestColorDetection:
+    def run(self, tty, **env):
+        """Output of message.error in a fresh interpreter, on a pty or a pipe."""
+        code = "from installers.messages import message; message.error('boom')"
+        cmd = [sys.executable, "-c", code]
+        cwd = Path(__file__).parents[1]
+        env = {"PATH": "", **env}
+        if not tty:
+            return subprocess.run(
+                cmd, stdout=subprocess.PIPE, text=True, cwd=cwd, env=env, check=True
+            ).stdout
+        primary, secondary = pty.openpty()
+        try:
+            subprocess.run(cmd, stdout=secondary, cwd=cwd, env=env, check=True)
+            return os.read(primary, 1024).decode()
+        finally:
+            os.close(primary)
+            os.close(secondary)
+
+    def test_terminal_output_is_colored(self):
+        assert self.run(tty=True) == "\033[91mboom\033[0m\r\n"
+
+    def test_piped_output_has_no_escapes(self):
+        assert self.run(tty=False) == "boom\n"
+
+    def test_no_color_disables_escapes(self):
+        assert self.run(tty=True, NO_COLOR="1") == "boom\r\n"
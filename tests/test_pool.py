@@ -0,0 +1,21 @@
+"""Tests for the shared installer worker pool."""
+
+from installers.pool import get_pool, shutdown_pool
+
+
+class TestPool:
+    def teardown_method(self):
+        shutdown_pool()
+
+    def test_pool_is_shared(self):
+        assert get_pool(2) is get_pool(4)
+
+    def test_shutdown_starts_a_fresh_pool(self):
+        pool = get_pool(2)
+        assert pool.submit(lambda: 42).result() == 42
+        shutdown_pool()
+        assert get_pool(2) is not pool
+
+    def test_shutdown_without_pool_is_a_no_op(self):
+        shutdown_pool()
+        shutdown_pool()
@@ -0,0 +1,206 @@
+"""Tests for SourceInstaller: make flags, the source cache and ccache."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from installers import source
+from installers.source import SourceInstaller
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(source, "CACHE_DIR", path)
+    return path
+
+
+@pytest.fixture
+def executor(tmp_path):
+    """Patch Executor so the 'download' just creates the source directory."""
+
+    def fake_download(url, cwd, message="", sha256=""):
+        (cwd / "tool-1.0").mkdir()
+        (cwd / "tool-1.0" / "configure").write_bytes(b"x" * 100)
+        return MagicMock(success=True)
+
+    with patch("installers.source.Executor") as MockExecutor:
+        instance = MockExecutor.return_value
+        instance.download_and_extract.side_effect = fake_download
+        instance.execute_cmd.return_value = MagicMock(success=True)
+        yield instance
+
+
+def make_installer(tmp_path, version="1.0", **kwargs):
+    return SourceInstaller(
+        name="tool",
+        binary_name="tool",
+        version=version,
+        archive_pattern="https://example.com/tool-{version}.tar.gz",
+        installation_path=str(tmp_path / "local"),
+        **kwargs,
+    )
+
+
+def executed(executor):
+    return [c.args[0] for c in executor.execute_cmd.call_args_list]
+
+
+class TestArchivePattern:
+    def test_url_is_formatted_at_construction(self, tmp_path):
+        installer = make_installer(tmp_path, version="2.1")
+        assert installer._archive_url == "https://example.com/tool-2.1.tar.gz"
+
+    def test_bad_pattern_fails_install_without_download(self, tmp_path, executor):
+        installer = SourceInstaller(
+            name="tool",
+            binary_name="tool",
+            version="1.0",
+            archive_pattern="https://example.com/tool-{release}.tar.gz",
+            installation_path=str(tmp_path / "local"),
+        )
+        assert installer._install() is False
+        executor.download_and_extract.assert_not_called()
+
+
+class TestMakeJobs:
+    def test_build_defaults_to_cpu_count(self, tmp_path, executor, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 6)
+        assert make_installer(tmp_path)._install() is True
+        assert ["make", "-j6"] in executed(executor)
+
+    def test_build_jobs_override(self, tmp_path, executor):
+        assert make_installer(tmp_path, build_jobs=2)._install() is True
+        assert ["make", "-j2"] in executed(executor)
+
+    def test_concurrent_builds_share_cpus(self, tmp_path, executor, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 8)
+        installer = make_installer(tmp_path)
+        installer.share_cpus(3)
+        assert installer._install() is True
+        assert ["make", "-j2"] in executed(executor)
+
+    def test_shared_build_keeps_one_job(self, tmp_path, executor):
+        installer = make_installer(tmp_path, build_jobs=2)
+        installer.share_cpus(4)
+        assert installer._install() is True
+        assert ["make", "-j1"] in executed(executor)
+
+    def test_install_is_serial_by_default(self, tmp_path, executor):
+        assert make_installer(tmp_path, build_jobs=4)._install() is True
+        assert executed(executor)[-1] == ["make", "install"]
+
+    def test_parallel_install(self, tmp_path, executor):
+        installer = make_installer(tmp_path, build_jobs=4, parallel_install=True)
+        assert installer._install() is True
+        assert executed(executor)[-1] == ["make", "install", "-j4"]
+
+    def test_unknown_cpu_count_builds_serially(self, tmp_path, executor, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: None)
+        assert make_installer(tmp_path)._install() is True
+        assert ["make", "-j1"] in executed(executor)
+
+
+class TestSourceCache:
+    def test_second_install_reuses_extracted_tree(self, tmp_path, executor):
+        assert make_installer(tmp_path)._install() is True
+        assert make_installer(tmp_path)._install() is True
+        executor.download_and_extract.assert_called_once()
+
+    def test_checksum_is_part_of_the_key(self, tmp_path, executor):
+        assert make_installer(tmp_path)._install() is True
+        assert make_installer(tmp_path, sha256="ab" * 32)._install() is True
+        assert executor.download_and_extract.call_count == 2
+
+    def test_builds_in_a_scratch_copy(self, tmp_path, executor, cache_dir):
+        def build(cmd, cwd, **kwargs):
+            (cwd / "built.o").touch()
+            build_dirs.append(cwd)
+            return MagicMock(success=True)
+
+        build_dirs = []
+        executor.execute_cmd.side_effect = build
+        assert make_installer(tmp_path)._install() is True
+        (entry,) = cache_dir.iterdir()
+        assert not (entry / "tool-1.0" / "built.o").exists()
+        assert all(not d.exists() for d in build_dirs)
+
+    def test_failed_download_leaves_no_entry(self, tmp_path, executor, cache_dir):
+        executor.download_and_extract.side_effect = None
+        executor.download_and_extract.return_value = MagicMock(success=False)
+        assert make_installer(tmp_path)._install() is False
+        assert list(cache_dir.iterdir()) == []
+
+    def test_evicts_least_recently_used(
+        self, tmp_path, executor, cache_dir, monkeypatch
+    ):
+        monkeypatch.setattr(SourceInstaller, "max_cache_bytes", 150)
+        assert make_installer(tmp_path, version="1.0")._install() is True
+        (old,) = cache_dir.iterdir()
+        os.utime(old, (0, 0))
+        assert make_installer(tmp_path, version="2.0")._install() is True
+        (kept,) = cache_dir.iterdir()
+        assert kept.name.startswith("tool-2.0-")
+
+    def test_eviction_while_staging_keeps_the_download(
+        self, tmp_path, executor, cache_dir, monkeypatch
+    ):
+        monkeypatch.setattr(SourceInstaller, "max_cache_bytes", 0)
+        real_rmtree = source.shutil.rmtree
+        evicted = []
+
+        def rmtree_after_eviction(path, *args, **kwargs):
+            # Just before the staged tree is renamed into place, another
+            # build leaves its cache entry and runs eviction
+            entry = path.name.startswith("tool-1.0-") and path.suffix != ".tmp"
+            if entry and not evicted:
+                evicted.append(path)
+                SourceInstaller._evict_cache()
+            return real_rmtree(path, *args, **kwargs)
+
+        monkeypatch.setattr(source.shutil, "rmtree", rmtree_after_eviction)
+        assert make_installer(tmp_path)._install() is True
+        assert evicted
+
+    def test_eviction_skips_staging_and_build_dirs(self, cache_dir, monkeypatch):
+        monkeypatch.setattr(SourceInstaller, "max_cache_bytes", 0)
+        for name in ("tool-1.0-abc.tmp", ".build-tool-xyz"):
+            (cache_dir / name).mkdir(parents=True)
+            (cache_dir / name / source.CACHE_SENTINEL).write_bytes(b"x" * 100)
+        SourceInstaller._evict_cache()
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_purge_cache(self, tmp_path, executor, cache_dir):
+        assert make_installer(tmp_path)._install() is True
+        SourceInstaller.purge_cache()
+        assert not cache_dir.exists()
+
+
+class TestCcache:
+    def env_for(self, executor, cmd):
+        for c in executor.execute_cmd.call_args_list:
+            if c.args[0] == cmd:
+                return c.kwargs["env"]
+        raise AssertionError(f"{cmd} was not run")
+
+    def test_wraps_compilers_when_available(self, tmp_path, executor, monkeypatch):
+        monkeypatch.setattr("shutil.which", lambda name: f"/usr/bin/{name}")
+        monkeypatch.delenv("CC", raising=False)
+        monkeypatch.setenv("CXX", "clang++")
+        assert make_installer(tmp_path, build_jobs=1)._install() is True
+        env = self.env_for(executor, ["make", "-j1"])
+        assert env["CC"] == "ccache gcc"
+        assert env["CXX"] == "ccache clang++"
+        assert env["CCACHE_DIR"] == str(source.CCACHE_DIR)
+
+    def test_inherits_environment_without_ccache(self, tmp_path, executor, monkeypatch):
+        monkeypatch.setattr("shutil.which", lambda name: None)
+        assert make_installer(tmp_path, build_jobs=1)._install() is True
+        assert self.env_for(executor, ["make", "-j1"]) is None
+
+    def test_can_be_disabled(self, tmp_path, executor, monkeypatch):
+        monkeypatch.setattr("shutil.which", lambda name: f"/usr/bin/{name}")
+        installer = make_installer(tmp_path, build_jobs=1, use_ccache=False)
+        assert installer._install() is True
+        assert self.env_for(executor, ["make", "-j1"]) is None
@@ -0,0 +1,186 @@
+"""Tests for SymlinkerInstaller: backups and symlink creation."""
+
+import os
+import shutil
+
+import pytest
+
+from installers import symlinker
+from installers.symlinker import SymlinkerInstaller, _clone_or_copy
+
+
+@pytest.fixture
+def dotfiles(tmp_path):
+    """A dotfiles/ source tree with one file and one directory."""
+    src = tmp_path / "dotfiles" / "config"
+    (src / "app").mkdir(parents=True)
+    (src / "app" / "settings").write_text("setting = 1\n")
+    (src / "rc").write_text("export A=1\n")
+    return src
+
+
+@pytest.fixture
+def installer(tmp_path, dotfiles):
+    return SymlinkerInstaller(
+        name="config",
+        source=str(dotfiles),
+        target=str(tmp_path / "home" / ".config"),
+        expand=True,
+        installation_path=str(tmp_path / "local"),
+        backup_dir=tmp_path / "backup",
+    )
+
+
+class TestSanitizeFilename:
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            ("nvim", "nvim"),
+            ("my config/v1.2", "my_config_v1.2"),
+            ("a:b*c", "a_b_c"),
+            ("café—x", "café_x"),
+        ],
+    )
+    def test_replaces_unsafe_characters(self, installer, name, expected):
+        assert installer._sanitize_filename(name) == expected
+
+
+class TestCloneOrCopy:
+    def test_falls_back_to_copy(self, tmp_path, monkeypatch):
+        def no_reflink(*args):
+            raise OSError("Operation not supported")
+
+        monkeypatch.setattr(symlinker.fcntl, "ioctl", no_reflink)
+        src = tmp_path / "src"
+        src.write_text("data")
+        src.chmod(0o640)
+        _clone_or_copy(src, tmp_path / "dst")
+        assert (tmp_path / "dst").read_text() == "data"
+        assert (tmp_path / "dst").stat().st_mode & 0o777 == 0o640
+
+    def test_copies_on_this_filesystem(self, tmp_path):
+        src = tmp_path / "src"
+        src.write_bytes(b"x" * 10000)
+        _clone_or_copy(src, tmp_path / "dst")
+        assert (tmp_path / "dst").read_bytes() == b"x" * 10000
+
+    def test_fifo_is_rejected_without_blocking(self, tmp_path):
+        tree = tmp_path / "tree"
+        tree.mkdir()
+        os.mkfifo(tree / "pipe")
+        with pytest.raises(shutil.Error):
+            shutil.copytree(tree, tmp_path / "copy", copy_function=_clone_or_copy)
+
+
+class TestBackupFile:
+    def test_backs_up_directory_tree(self, installer, tmp_path):
+        existing = tmp_path / "home" / ".config" / "app"
+        existing.mkdir(parents=True)
+        (existing / "settings").write_text("old\n")
+        backup = installer.backup_file(existing)
+        assert (backup / "settings").read_text() == "old\n"
+
+    def test_missing_path_is_not_backed_up(self, installer, tmp_path):
+        assert installer.backup_file(tmp_path / "absent") is None
+
+
+class TestInstall:
+    def test_expand_links_each_entry(self, installer, tmp_path, dotfiles):
+        assert installer._install() is True
+        target = tmp_path / "home" / ".config"
+        assert (target / "rc").resolve() == (dotfiles / "rc").resolve()
+        assert (target / "app").resolve() == (dotfiles / "app").resolve()
+
+    def test_existing_file_is_backed_up_and_replaced(
+        self, installer, tmp_path, dotfiles
+    ):
+        target = tmp_path / "home" / ".config"
+        target.mkdir(parents=True)
+        (target / "rc").write_text("old rc\n")
+        assert installer._install() is True
+        assert (target / "rc").is_symlink()
+        (backup,) = (tmp_path / "backup").iterdir()
+        assert (backup / "config" / "rc").read_text() == "old rc\n"
+
+    def test_second_run_keeps_existing_links(self, installer, tmp_path):
+        assert installer._install() is True
+        link = tmp_path / "home" / ".config" / "rc"
+        inode = link.lstat().st_ino
+        assert installer._install() is True
+        assert link.lstat().st_ino == inode
+        assert not any((tmp_path / "backup").iterdir())
+
+    def test_broken_link_is_replaced_without_backup(self, installer, tmp_path):
+        target = tmp_path / "home" / ".config"
+        target.mkdir(parents=True)
+        (target / "rc").symlink_to(tmp_path / "gone")
+        assert installer._install() is True
+        assert (target / "rc").read_text() == "export A=1\n"
+        assert not any((tmp_path / "backup").iterdir())
+
+    def test_existing_directory_is_replaced(self, installer, tmp_path):
+        target = tmp_path / "home" / ".config" / "app"
+        target.mkdir(parents=True)
+        (target / "old").write_text("old\n")
+        assert installer._install() is True
+        assert target.is_symlink()
+        assert (target / "settings").exists()
+
+    def test_parent_is_created_once(self, installer, tmp_path, monkeypatch):
+        calls = []
+        real_mkdir = symlinker.Path.mkdir
+
+        def counting_mkdir(self, *args, **kwargs):
+            if kwargs.get("parents"):  # not pathlib's own recursive calls
+                calls.append(self)
+            return real_mkdir(self, *args, **kwargs)
+
+        monkeypatch.setattr(symlinker.Path, "mkdir", counting_mkdir)
+        assert installer._install() is True
+        assert calls.count((tmp_path / "home" / ".config").resolve()) == 1
+
+    def test_expand_resolves_only_linked_entries(
+        self, installer, tmp_path, dotfiles, monkeypatch
+    ):
+        (tmp_path / "elsewhere").write_text("x\n")
+        (dotfiles / "alias").symlink_to(tmp_path / "elsewhere")
+        resolved = []
+        real_resolve = symlinker.Path.resolve
+
+        def counting_resolve(self, *args, **kwargs):
+            resolved.append(self.name)
+            return real_resolve(self, *args, **kwargs)
+
+        monkeypatch.setattr(symlinker.Path, "resolve", counting_resolve)
+        assert installer._install() is True
+        target = tmp_path / "home" / ".config"
+        assert (target / "alias").readlink() == tmp_path / "elsewhere"
+        assert "rc" not in resolved
+        assert "alias" in resolved
+
+    def test_direct_mapping_links_source_root(self, tmp_path, dotfiles):
+        installer = SymlinkerInstaller(
+            name="rc",
+            source=str(dotfiles / "rc"),
+            target=str(tmp_path / "home" / ".rc"),
+            installation_path=str(tmp_path / "local"),
+            backup_dir=tmp_path / "backup",
+        )
+        assert installer._install() is True
+        link = tmp_path / "home" / ".rc"
+        assert link.readlink() == (dotfiles / "rc").resolve()
+
+    def test_expand_links_relative_to_open_target_dir(
+        self, installer, tmp_path, monkeypatch
+    ):
+        calls = []
+        real_symlink = symlinker.os.symlink
+
+        def recording_symlink(src, dst, *args, dir_fd=None, **kwargs):
+            calls.append((dst, dir_fd))
+            return real_symlink(src, dst, *args, dir_fd=dir_fd, **kwargs)
+
+        monkeypatch.setattr(symlinker.os, "symlink", recording_symlink)
+        assert installer._install() is True
+        assert sorted(dst for dst, _ in calls) == ["app", "rc"]
+        assert all(fd is not None for _, fd in calls)
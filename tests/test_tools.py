@@ -0,0 +1,276 @@
+"""Tests for installers.tools: tildify and the Executor helpers."""
+
+import hashlib
+import logging
+import tarfile
+import threading
+
+import pytest
+
+from installers import tools
+from installers.tools import HOME, Executor, tildify
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """A .tar.gz holding pkg-1.0/bin/tool, served through a file:// URL."""
+    src = tmp_path / "src" / "pkg-1.0" / "bin"
+    src.mkdir(parents=True)
+    (src / "tool").write_text("#!/bin/sh\necho tool 1.0\n")
+    (src / "tool").chmod(0o755)
+    path = tmp_path / "pkg.tar.gz"
+    with tarfile.open(path, "w:gz") as tf:
+        tf.add(tmp_path / "src" / "pkg-1.0", arcname="pkg-1.0")
+    return path
+
+
+class TestTildify:
+    def test_path_under_home(self):
+        assert tildify(f"{HOME}/local/bin") == "~/local/bin"
+
+    def test_home_itself(self):
+        assert tildify(HOME) == "~"
+
+    def test_path_outside_home(self):
+        assert tildify("/opt/tool") == "/opt/tool"
+
+    def test_sibling_with_common_prefix(self):
+        assert tildify(f"{HOME}extra/bin") == f"{HOME}extra/bin"
+
+
+class TestDownloadAndExtract:
+    def test_extracts_archive(self, archive, tmp_path):
+        dest = tmp_path / "out"
+        dest.mkdir()
+        result = Executor().download_and_extract(archive.as_uri(), cwd=dest)
+        assert result.success is True
+        assert (dest / "pkg-1.0" / "bin" / "tool").is_file()
+
+    @pytest.mark.parametrize("compression", ["bz2", "xz"])
+    def test_detects_compression(self, tmp_path, compression):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "README").write_text("hello")
+        path = tmp_path / f"pkg.tar.{compression}"
+        with tarfile.open(path, f"w:{compression}") as tf:
+            tf.add(tmp_path / "pkg", arcname="pkg")
+        dest = tmp_path / "out"
+        dest.mkdir()
+        result = Executor().download_and_extract(path.as_uri(), cwd=dest)
+        assert result.success is True
+        assert (dest / "pkg" / "README").read_text() == "hello"
+
+    def test_missing_archive_fails(self, tmp_path):
+        url = (tmp_path / "missing.tar.gz").as_uri()
+        result = Executor().download_and_extract(url, cwd=tmp_path)
+        assert result.success is False
+
+    def test_sha256_mismatch_fails(self, archive, tmp_path):
+        dest = tmp_path / "out"
+        dest.mkdir()
+        result = Executor().download_and_extract(
+            archive.as_uri(), cwd=dest, sha256="0" * 64
+        )
+        assert result.success is False
+
+    def test_matching_sha256_succeeds(self, archive, tmp_path):
+        dest = tmp_path / "out"
+        dest.mkdir()
+        digest = hashlib.sha256(archive.read_bytes()).hexdigest()
+        result = Executor().download_and_extract(
+            archive.as_uri(), cwd=dest, sha256=digest
+        )
+        assert result.success is True
+
+    def test_zstd_archive_without_zstandard_fails(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tools, "zstandard", None)
+        path = tmp_path / "pkg.tar.zst"
+        path.write_bytes(b"")
+        result = Executor().download_and_extract(path.as_uri(), cwd=tmp_path)
+        assert result.success is False
+
+    def test_extracts_zstd_archive(self, archive, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        with tarfile.open(tmp_path / "pkg.tar", "w") as tf:
+            tf.add(tmp_path / "src" / "pkg-1.0", arcname="pkg-1.0")
+        path = tmp_path / "pkg.tar.zst"
+        raw = (tmp_path / "pkg.tar").read_bytes()
+        path.write_bytes(zstandard.ZstdCompressor().compress(raw))
+        dest = tmp_path / "out"
+        dest.mkdir()
+        result = Executor().download_and_extract(path.as_uri(), cwd=dest)
+        assert result.success is True
+        assert (dest / "pkg-1.0" / "bin" / "tool").exists()
+
+    def test_corrupt_archive_fails(self, tmp_path):
+        bad = tmp_path / "bad.tar.gz"
+        bad.write_bytes(b"not a tarball")
+        result = Executor().download_and_extract(bad.as_uri(), cwd=tmp_path)
+        assert result.success is False
+
+
+class TestInstallFromUrl:
+    def test_runs_downloaded_script(self, tmp_path):
+        script = tmp_path / "install.sh"
+        script.write_text(f"touch {tmp_path / 'ran'}\n")
+        result = Executor().install_from_url(script.as_uri())
+        assert result.success is True
+        assert (tmp_path / "ran").exists()
+
+    def test_sha256_mismatch_does_not_run(self, tmp_path):
+        script = tmp_path / "install.sh"
+        script.write_text(f"touch {tmp_path / 'ran'}\n")
+        result = Executor().install_from_url(script.as_uri(), sha256="0" * 64)
+        assert result.success is False
+        assert not (tmp_path / "ran").exists()
+
+    def test_matching_sha256_runs(self, tmp_path):
+        script = tmp_path / "install.sh"
+        script.write_text(f"touch {tmp_path / 'ran'}\n")
+        digest = hashlib.sha256(script.read_bytes()).hexdigest()
+        result = Executor().install_from_url(script.as_uri(), sha256=digest)
+        assert result.success is True
+        assert (tmp_path / "ran").exists()
+
+    def test_missing_script_fails(self, tmp_path):
+        url = (tmp_path / "missing.sh").as_uri()
+        result = Executor().install_from_url(url)
+        assert result.success is False
+
+
+class TestExtractMember:
+    def test_writes_only_matching_member(self, archive, tmp_path):
+        dest = tmp_path / "tool"
+        result = Executor().extract_member(
+            archive.as_uri(), dest=dest, match=lambda m: m.name.endswith("/tool")
+        )
+        assert result.success is True
+        assert dest.read_text().startswith("#!/bin/sh")
+        assert not (tmp_path / "pkg-1.0").exists()
+
+    def test_no_match_fails(self, archive, tmp_path):
+        dest = tmp_path / "tool"
+        result = Executor().extract_member(
+            archive.as_uri(), dest=dest, match=lambda m: False
+        )
+        assert result.success is False
+        assert not dest.exists()
+
+    def test_missing_archive_fails(self, tmp_path):
+        url = (tmp_path / "missing.tar.gz").as_uri()
+        result = Executor().extract_member(url, dest=tmp_path / "tool", match=bool)
+        assert result.success is False
+
+    def test_matching_sha256_succeeds(self, archive, tmp_path):
+        digest = hashlib.sha256(archive.read_bytes()).hexdigest()
+        result = Executor().extract_member(
+            archive.as_uri(),
+            dest=tmp_path / "tool",
+            match=lambda m: m.name.endswith("/tool"),
+            sha256=digest.upper(),
+        )
+        assert result.success is True
+
+    def test_sha256_mismatch_fails(self, archive, tmp_path):
+        result = Executor().extract_member(
+            archive.as_uri(),
+            dest=tmp_path / "tool",
+            match=lambda m: m.name.endswith("/tool"),
+            sha256="0" * 64,
+        )
+        assert result.success is False
+        assert "SHA-256 mismatch" in result.result.stderr
+
+
+class TestExecuteCmd:
+    def test_short_output_is_one_record(self, caplog):
+        with caplog.at_level(logging.INFO, logger="installers.tools"):
+            result = Executor().execute_cmd(
+                ["sh", "-c", "echo out; echo err >&2"], message="demo"
+            )
+        assert result.success is True
+        (record,) = caplog.records
+        text = record.getMessage()
+        assert "demo" in text
+        assert "OUTPUT:\nout\nerr\n" in text
+        assert "Exit status: 0" in text
+
+    def test_failure_keeps_output_tail(self, caplog):
+        with caplog.at_level(logging.INFO, logger="installers.tools"):
+            result = Executor().execute_cmd(["sh", "-c", "echo boom >&2; exit 3"])
+        assert result.success is False
+        assert result.result.stdout == "boom\n"
+        (record,) = caplog.records
+        assert "Exit status: 3" in record.getMessage()
+
+    def test_tail_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(tools, "TAIL_LINES", 3)
+        result = Executor().execute_cmd(["sh", "-c", "seq 1 100; exit 1"])
+        assert result.result.stdout == "98\n99\n100\n"
+
+    def test_failure_tail_is_in_stdout_and_stderr(self):
+        result = Executor().execute_cmd(["sh", "-c", "echo out; echo err >&2; exit 1"])
+        assert result.result.stdout == "out\nerr\n"
+        assert result.result.stderr == result.result.stdout
+
+    def test_long_output_is_logged_in_blocks(self, caplog, monkeypatch):
+        monkeypatch.setattr(tools, "LOG_BLOCK_CHARS", 100)
+        with caplog.at_level(logging.INFO, logger="installers.tools"):
+            Executor().execute_cmd(["seq", "1", "1000"])
+        assert len(caplog.records) > 1
+        logged = "".join(r.getMessage() for r in caplog.records)
+        assert "\n1000\n" in logged
+
+    def test_input_is_passed_to_stdin(self, caplog):
+        with caplog.at_level(logging.INFO, logger="installers.tools"):
+            result = Executor().execute_cmd(["cat"], input="token\n")
+        assert result.success is True
+        assert "OUTPUT:\ntoken\n" in caplog.records[0].getMessage()
+
+    def test_large_input_to_a_child_that_writes_first(self):
+        # The child fills its output pipe before it reads any input
+        script = "head -c 200000 /dev/zero; cat > /dev/null"
+        results = []
+        worker = threading.Thread(
+            target=lambda: results.append(
+                Executor().execute_cmd(["sh", "-c", script], input="x" * 1_000_000)
+            ),
+            daemon=True,
+        )
+        worker.start()
+        worker.join(timeout=30)
+        assert not worker.is_alive(), "execute_cmd deadlocked"
+        assert results[0].success is True
+
+    def test_capture_on_success_returns_output(self):
+        result = Executor().execute_cmd(
+            ["sh", "-c", "echo out; echo err >&2"], capture_on_success=True
+        )
+        assert result.success is True
+        assert result.result.stdout == "out\n"
+        assert result.result.stderr == "err\n"
+
+    def test_preexec_fn_is_rejected(self):
+        with pytest.raises(ValueError):
+            Executor().execute_cmd(["true"], preexec_fn=lambda: None)
+
+    def test_command_is_resolved_once(self, monkeypatch):
+        lookups = []
+        real_which = tools.shutil.which
+
+        def counting_which(name, path=None):
+            lookups.append(name)
+            return real_which(name, path=path)
+
+        monkeypatch.setattr(tools, "_executables", {})
+        monkeypatch.setattr(tools.shutil, "which", counting_which)
+        assert Executor().execute_cmd(["true"]).success is True
+        assert Executor().execute_cmd(["true"]).success is True
+        assert lookups == ["true"]
+
+    def test_missing_command_is_logged_and_raised(self, caplog):
+        with (
+            caplog.at_level(logging.INFO, logger="installers.tools"),
+            pytest.raises(FileNotFoundError),
+        ):
+            Executor().execute_cmd(["definitely-not-a-command-xyz"])
+        assert "definitely-not-a-command-xyz" in caplog.records[0].getMessage()